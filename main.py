@@ -17,11 +17,12 @@ from rapidfuzz import fuzz
 
 # ── Import sub-modules ──────────────────────────────────────────────────
 from ocr_modules.config import (
-    FIRM_PATTERN, INITIALS_PATTERN, PARISH_DICT_KNOWN, CITIES_PAR,
+    FIRM_MATCHER, INITIALS_PATTERN, PARISH_DICT_KNOWN, CITIES_PAR,
 )
-from ocr_modules.utils import remove_accents, fuzzy_match_rapidfuzz
+from ocr_modules.utils import remove_accents, map_unique, fuzzy_match_rapidfuzz
 from ocr_modules import data_loader
 from ocr_modules import last_name_matching
+from ocr_modules import match_cache
 from ocr_modules import line_processing
 from ocr_modules import initials_names
 from ocr_modules import occupation
@@ -39,6 +40,8 @@ def run_pipeline(
     output_prefix: str = "final_output",
     checkpoint_prefix: str | None = None,
     report_dir: str | None = None,
+    match_cache_path: str | None = None,
+    match_batch: bool = False,
 ) -> None:
     out_path = Path(out_dir)
     out_path.mkdir(parents=True, exist_ok=True)
@@ -73,9 +76,19 @@ def run_pipeline(
     # STEP 2 – Last-name matching (A1 → A5)  [parallelised]
     # ================================================================
     print("[Step 2/14] Running last-name matching (A1-A5) ...")
-    surname_list = last_name_matching.parallel_alt_algorithm(
-        surname_list, df_death_reg_unacc, dirty_last_names_list,
-    )
+    match_stats = {}
+    cache = None
+    if match_cache_path:
+        cache = match_cache.MatchCache.for_references(
+            match_cache_path, df_death_reg_unacc, dirty_last_names_list)
+    try:
+        surname_list = last_name_matching.parallel_alt_algorithm(
+            surname_list, df_death_reg_unacc, dirty_last_names_list,
+            batch=match_batch, stats=match_stats, cache=cache,
+        )
+    finally:
+        if cache is not None:
+            cache.close()
 
     surname_list["unique_key"] = (
         surname_list["page"].astype(str) + "_"
@@ -85,7 +98,7 @@ def run_pipeline(
     )
     df_dash = surname_list[surname_list["line"] == "-"]
     surname_list = surname_list[surname_list["line"] != "-"]
-    reporter.capture(2, "Last-name matching", surname_list)
+    reporter.capture(2, "Last-name matching", surname_list, extra=match_stats)
 
     # Checkpoint
     alt_alg_checkpoint = _ckpt("alt_alg_checkpoint.csv")
@@ -107,52 +120,51 @@ def run_pipeline(
     # STEP 4 – Main processing loop (pass 0 & 1)
     # ================================================================
     occ_list = data_loader.load_occupation_list()
-    prefix_dict = initials_names.build_prefix_dict(first_names)
+    occ_index = occupation.build_occupation_index(occ_list)
+    occ_vocab = occupation.build_occupation_vocabulary(occ_list)
+    first_name_set = initials_names.build_first_name_set(first_names)
 
     for loop_i in range(2):
         print(f"[Step 4/14] Main processing loop – pass {loop_i} ...")
 
         # 4a – Residual line
-        surname_list["residual_line"] = ""
-        surname_list = surname_list.apply(line_processing.get_the_residual_line, axis=1)
+        residuals = line_processing.ResidualLines(surname_list["line_complete"])
+        (surname_list["last_name_start"],
+         surname_list["last_name_end"]) = residuals.remove_first(surname_list["last_name"])
+        surname_list["residual_line"] = residuals.text
 
         # 4b – Initials
-        surname_list["initials"] = ""
-        surname_list = surname_list.apply(initials_names.get_initials, axis=1)
-        surname_list = initials_names.first_name(surname_list, first_names, prefix_dict)
+        surname_list["initials"] = initials_names.extract_initials(surname_list["residual_line"])
+        surname_list = initials_names.first_name(surname_list, first_names,
+                                                  first_name_set=first_name_set)
 
         # 4c – Update residual after initials
-        surname_list = surname_list.apply(line_processing.update_residual_after_initials, axis=1)
+        (surname_list["initials_start"],
+         surname_list["initials_end"]) = residuals.remove_first(surname_list["initials"])
+        surname_list["residual_line"] = residuals.text
+        surname_list["initials"] = line_processing.strip_dotted_initials(surname_list["initials"])
 
         # 4d – Second last name
         surname_list["second_last_name"] = ""
         surname_list = surname_list.apply(initials_names.second_last_name, axis=1)
-        surname_list = surname_list.apply(
-            line_processing.update_residual_after_second_last_name, axis=1)
+        residuals.remove_first(surname_list["second_last_name"])
 
         # 4e – f.d. removal + Occupation extraction
-        surname_list["f_d_"] = surname_list["residual_line"].apply(
-            lambda x: 1 if re.search(r'\bf\.\s*d\.', x) else 0)
-        surname_list["residual_line"] = surname_list.apply(
-            lambda x: re.sub(r'\bf\.\s*d\.', "", str(x["residual_line"]))
-            if x["f_d_"] == 1 else x["residual_line"], axis=1)
-        surname_list["residual_line"] = surname_list.apply(
-            lambda x: x["residual_line"][1:].strip()
-            if x["f_d_"] == 1 and x["residual_line"] and x["residual_line"][0] == ","
-            else x["residual_line"], axis=1)
+        surname_list["f_d_"] = residuals.remove_f_d()
+        surname_list["residual_line"] = residuals.text
 
         surname_list["occ_reg"] = ""
         surname_list = surname_list.apply(
-            lambda row: occupation.extract_occ(row, occ_list), axis=1)
+            lambda row: occupation.extract_occ(row, occ_list, occ_index), axis=1)
 
         # 4f – Update residual after occupation
-        surname_list = surname_list.apply(
-            line_processing.update_residual_after_occupation, axis=1)
+        (surname_list["occ_reg_start"],
+         surname_list["occ_reg_end"]) = residuals.remove_occupation(surname_list["occ_reg"])
+        surname_list["residual_line"] = residuals.text
 
         # ── Pass-0-only: line splitting + income ──
         if loop_i == 0:
-            surname_list = surname_list.groupby(["page", "column"]).apply(
-                lambda g: line_processing.split_line(g, occ_list))
+            surname_list = line_processing.parallel_split_line(surname_list, occ_list)
             surname_list = surname_list.drop(columns={"column", "page"}).reset_index()
             surname_list = surname_list.drop(columns={"level_2"})
             surname_list = income.find_income(
@@ -161,19 +173,15 @@ def run_pipeline(
 
         # ── Pass-1-only: income re-extraction + parish + firm/estate ──
         if loop_i == 1:
-            surname_list["income"] = 0
-            surname_list = surname_list.apply(income.extr_inc, axis=1)
-            surname_list["income_1"] = ""
-            surname_list["income_2"] = ""
-            surname_list = surname_list.apply(income.split_income, axis=1)
-            surname_list["income"] = surname_list["income"].apply(
-                lambda x: x if bool(re.search(r'\d', str(x))) else "")
+            surname_list = income.extract_income(surname_list)
 
             # Secondary lowercase last-name adjustment
             surname_list = line_processing.adj_sec_lowercase_LN(surname_list)
 
             # Parish extraction (3 passes)
             surname_list["parish"] = ""
+            surname_list["parish_start"] = -1
+            surname_list["parish_end"] = -1
             surname_list = surname_list.apply(parish.extract_parish, axis=1)
             surname_list = surname_list.apply(parish.extract_parish_no_init, axis=1)
             surname_list = surname_list.apply(parish.extra_parish_residual_cases, axis=1)
@@ -181,7 +189,7 @@ def run_pipeline(
             # Spot wrong occupation
             surname_list["change_occ"] = 0
             surname_list = surname_list.apply(
-                lambda row: parish.spot_wrong_occ(row, occ_list), axis=1)
+                lambda row: parish.spot_wrong_occ(row, occ_list, occ_vocab), axis=1)
             surname_list["parish"] = surname_list.apply(
                 lambda x: "" if x["parish"] == x["parish"] and x["index"] == "A1"
                 else x["parish"], axis=1)
@@ -190,25 +198,24 @@ def run_pipeline(
             surname_list = surname_list.apply(initials_names.adj_initials_dupl, axis=1)
 
             # Parish post-processing
-            surname_list["parish"] = surname_list["parish"].apply(
-                lambda x: re.sub(r'\d+', "", str(x)))
-            surname_list["parish"] = surname_list["parish"].apply(
-                lambda x: "" if re.search(FIRM_PATTERN, x) else x)
+            surname_list["parish"] = map_unique(
+                surname_list["parish"], lambda x: re.sub(r'\d+', "", str(x)))
+            surname_list["parish"] = map_unique(
+                surname_list["parish"], lambda x: "" if FIRM_MATCHER.has_match(x) else x)
             surname_list["parish"] = surname_list.apply(
                 lambda x: "" if x["parish"].endswith(x["occ_reg"]) else x["parish"], axis=1)
             surname_list["parish"] = surname_list.apply(
                 lambda row: ""
-                if ((row["parish"].lower() in occ_list["occ_llm"].values
-                     or re.search(FIRM_PATTERN, row["parish"])
-                     or any(word in occ_list["occ_llm"].values
-                            for word in row["parish"].lower().split()))
+                if ((row["parish"].lower() in occ_vocab.words
+                     or FIRM_MATCHER.has_match(row["parish"])
+                     or not occ_vocab.words.isdisjoint(row["parish"].lower().split()))
                     and len(re.findall(r'[a-z]', row["parish"])) > 4
                     and "-" not in row["parish"])
                 else row["parish"], axis=1)
 
             # Firm & estate tokens
             surname_list["firm_dummy"] = 0
-            surname_list = surname_list.apply(firm_estate.firm_token, axis=1)
+            surname_list["firm_dummy"] = firm_estate.firm_dummy(surname_list)
             surname_list = firm_estate._ind_FT(
                 surname_list, df_death_reg_unacc, surname_list)
 
@@ -220,7 +227,7 @@ def run_pipeline(
                 else row["initials"], axis=1)
 
             surname_list["estate_dummy"] = 0
-            surname_list = surname_list.apply(firm_estate.estate_token, axis=1)
+            surname_list["estate_dummy"] = firm_estate.estate_dummy(surname_list)
             reporter.capture(4, "Main loop pass 1", surname_list)
 
     # ================================================================
@@ -241,10 +248,11 @@ def run_pipeline(
     # ================================================================
     print("[Step 6/14] Adjusting suspect occupations ...")
     surname_list = surname_list.apply(
-        lambda row: occupation.adj_suspect_occ(row, occ_list), axis=1)
+        lambda row: occupation.adj_suspect_occ(row, occ_list, occ_vocab), axis=1)
     reporter.capture(6, "Suspect occupation adjustment", surname_list)
 
     # Checkpoint
+    surname_list = line_processing.clear_stale_spans(surname_list)
     a_4_checkpoint = _ckpt("a_4.csv")
     surname_list.to_csv(a_4_checkpoint, index=False)
     surname_list = pd.read_csv(a_4_checkpoint)
@@ -296,34 +304,35 @@ def run_pipeline(
 
             # Re-run parish passes
             surname_list["parish"] = ""
+            surname_list["parish_start"] = -1
+            surname_list["parish_end"] = -1
             surname_list = surname_list.apply(parish.extract_parish, axis=1)
             surname_list = surname_list.apply(parish.extract_parish_no_init, axis=1)
             surname_list = surname_list.apply(parish.extra_parish_residual_cases, axis=1)
             surname_list["change_occ"] = 0
             surname_list = surname_list.apply(
-                lambda row: parish.spot_wrong_occ(row, occ_list), axis=1)
+                lambda row: parish.spot_wrong_occ(row, occ_list, occ_vocab), axis=1)
             surname_list["parish"] = surname_list.apply(
                 lambda x: "" if x["parish"] == x["parish"] and x["index"] == "A1"
                 else x["parish"], axis=1)
             surname_list = surname_list.apply(initials_names.adj_initials_dupl, axis=1)
-            surname_list["parish"] = surname_list["parish"].apply(
-                lambda x: re.sub(r'\d+', "", str(x)))
-            surname_list["parish"] = surname_list["parish"].apply(
-                lambda x: "" if re.search(FIRM_PATTERN, x) else x)
+            surname_list["parish"] = map_unique(
+                surname_list["parish"], lambda x: re.sub(r'\d+', "", str(x)))
+            surname_list["parish"] = map_unique(
+                surname_list["parish"], lambda x: "" if FIRM_MATCHER.has_match(x) else x)
             surname_list["parish"] = surname_list.apply(
                 lambda x: "" if x["parish"].endswith(x["occ_reg"]) else x["parish"], axis=1)
             surname_list["parish"] = surname_list.apply(
                 lambda row: ""
-                if ((row["parish"].lower() in occ_list["occ_llm"].values
-                     or re.search(FIRM_PATTERN, row["parish"])
-                     or any(word in occ_list["occ_llm"].values
-                            for word in row["parish"].lower().split()))
+                if ((row["parish"].lower() in occ_vocab.words
+                     or FIRM_MATCHER.has_match(row["parish"])
+                     or not occ_vocab.words.isdisjoint(row["parish"].lower().split()))
                     and len(re.findall(r'[a-z]', row["parish"])) > 4
                     and "-" not in row["parish"])
                 else row["parish"], axis=1)
 
             surname_list = surname_list.apply(
-                lambda row: occupation.adj_suspect_occ(row, occ_list), axis=1)
+                lambda row: occupation.adj_suspect_occ(row, occ_list, occ_vocab), axis=1)
 
         if class_i == 0:
             surname_list = surname_list.apply(
@@ -331,17 +340,20 @@ def run_pipeline(
             del certain
             del remaining_lines
 
+    # line_complete is final from here on; re-anchor the field spans to it.
+    surname_list = line_processing.locate_fields(surname_list)
+
     # ================================================================
     # STEP 9 – Fuzzy occupation matching + secondary occupation
     # ================================================================
     print("[Step 9/14] Fuzzy occupation matching ...")
-    surname_list["occ_reg"] = surname_list.apply(
-        lambda row: row["occ_reg"] if row["occ_reg"] != ""
-        else occupation.occ_fuzz(row, occ_list), axis=1)
+    surname_list["occ_reg"] = surname_list["occ_reg"].where(
+        surname_list["occ_reg"] != "",
+        occupation.batch_occ_fuzz(surname_list, occ_list))
 
-    surname_list["occ_reg_2"] = surname_list.apply(
-        lambda row: row["occ_reg"] if row["occ_reg"] == ""
-        else occupation.sec_occup(row, occ_list), axis=1)
+    surname_list["occ_reg_2"] = surname_list["occ_reg"].where(
+        surname_list["occ_reg"] == "",
+        occupation.batch_sec_occup(surname_list, occ_list))
     reporter.capture(9, "Fuzzy occupation matching", surname_list)
 
     # ================================================================
@@ -359,7 +371,7 @@ def run_pipeline(
 
     # Re-extract parishes for the subset still missing them
     df_subset = surname_list[
-        (~surname_list["line"].str.contains(FIRM_PATTERN, regex=True, na=False))
+        (~FIRM_MATCHER.contains(surname_list["line"], na=False))
         & (surname_list["last_name"] != "")
         & (surname_list["split"].isin([1, 3]))
         & (surname_list["parish"] == "")
@@ -379,33 +391,28 @@ def run_pipeline(
     surname_list["parish_cleaned_"] = ""
     surname_list = surname_list.fillna("")
     proper_parish = pd.read_csv("proper_parish.csv", index_col=0).fillna("")
+    parish_ref = parish.build_parish_reference(proper_parish)
 
     surname_list = surname_list.apply(parish.cleaned_parish, axis=1)
     surname_list = surname_list.apply(
-        lambda row: parish.parish_map(row, proper_parish), axis=1)
-
-    surname_list = surname_list.merge(
-        proper_parish[["parish", "mapped_parish", "parish_cleaned"]],
-        on="parish", how="left")
-    surname_list["parish_cleaned_"] = surname_list.apply(
-        lambda row: row["mapped_parish"]
-        if pd.notna(row["mapped_parish"]) and row["mapped_parish"] != ""
-        else (row["parish_cleaned"]
-              if pd.notna(row["parish_cleaned"]) and row["parish_cleaned"] != ""
-              else row["parish"]), axis=1)
-    surname_list = surname_list.fillna("")
+        lambda row: parish.parish_map(row, proper_parish, parish_ref), axis=1)
+
+    surname_list = surname_list.reset_index(drop=True)
+    surname_list["parish_cleaned_"] = parish.map_proper_parish(
+        surname_list["parish"], parish_ref)
     surname_list = surname_list.apply(parish.cleaned_parish, axis=1)
-    surname_list = surname_list.drop(columns={"parish_cleaned", "mapped_parish"})
 
     # Parish adjustment passes
     surname_list = surname_list.apply(
-        lambda row: parish.parish_adjustment(row, proper_parish, comma=True), axis=1)
+        lambda row: parish.parish_adjustment(row, proper_parish, comma=True,
+                                             parish_ref=parish_ref), axis=1)
     surname_list = surname_list.apply(
-        lambda row: parish.parish_adjustment(row, proper_parish, comma=False), axis=1)
+        lambda row: parish.parish_adjustment(row, proper_parish, comma=False,
+                                             parish_ref=parish_ref), axis=1)
 
     # Remove firm patterns from parish
     parish_num = pd.DataFrame(surname_list["parish"].unique())
-    parish_firm = parish_num[parish_num[0].str.contains(FIRM_PATTERN, regex=True)]
+    parish_firm = parish_num[FIRM_MATCHER.contains(parish_num[0])]
     parish_num = parish_num[~parish_num[0].isin(parish_firm[0])]
     surname_list = surname_list.apply(
         lambda row: parish.remove_firms_from_parish(row, parish_num, parish_firm), axis=1)
@@ -421,7 +428,7 @@ def run_pipeline(
 
     # Refresh parish_num and re-clean
     parish_num = pd.DataFrame(surname_list["parish"].unique())
-    parish_firm = parish_num[parish_num[0].str.contains(FIRM_PATTERN, regex=True)]
+    parish_firm = parish_num[FIRM_MATCHER.contains(parish_num[0])]
     parish_num = parish_num[~parish_num[0].isin(parish_firm[0])]
     surname_list = surname_list.apply(
         lambda row: parish.remove_firms_from_parish(row, parish_num, parish_firm), axis=1)
@@ -432,7 +439,7 @@ def run_pipeline(
     surname_list["parish"] = surname_list.apply(
         lambda x: ""
         if (x["parish"] == x["initials"] and not re.search(r'\.', x["initials"])
-            and any(name == x["initials"] for name in first_names.values))
+            and x["initials"] in first_name_set)
         else x["parish"], axis=1)
     surname_list["parish"] = surname_list.apply(
         lambda x: ""
@@ -454,6 +461,7 @@ def run_pipeline(
     surname_list.loc[mask, "initials"] = ""
 
     # Checkpoint
+    surname_list = line_processing.clear_stale_spans(surname_list)
     aaa_5_checkpoint = _ckpt("aaa_5.csv")
     surname_list.to_csv(aaa_5_checkpoint, index=False)
     surname_list = pd.read_csv(aaa_5_checkpoint).fillna("")
@@ -491,7 +499,7 @@ def run_pipeline(
                     row["initials"] = ""
                     line_split_space = [ch.replace(",", "").strip() for ch in line.split()]
                     candidate = [word for word in line_split_space
-                                 if word in first_names.values and word != last_name and len(word) > 2]
+                                 if word in first_name_set and word != last_name and len(word) > 2]
                     if candidate:
                         row["initials"] = candidate[0]
                     return row
@@ -522,12 +530,12 @@ def run_pipeline(
                 if pos_initial > 0 and any(word.islower()
                                            for word in line_split[pos_initial - 1].split()):
                     row["initials"] = ""
-                    if len(line_split) > 1 and line_split[1].strip() in first_names.values:
+                    if len(line_split) > 1 and line_split[1].strip() in first_name_set:
                         row["initials"] = line_split[1].strip()
         elif (last_name != ""
-              and any(word.strip() in first_names.values for word in line_split)):
+              and any(word.strip() in first_name_set for word in line_split)):
             candidate = [w for w in line_split
-                         if w in first_names.values and w != last_name and len(w) > 2]
+                         if w in first_name_set and w != last_name and len(w) > 2]
             row["initials"] = ' '.join(candidate).strip()
         return row
 
@@ -561,7 +569,7 @@ def run_pipeline(
             line_split_space = line.split()
             line_split_space = [ch.replace(",", "").strip() for ch in line_split_space]
             candidate = [word for word in line_split_space
-                         if word in first_names.values and word != last_name and len(word) > 2]
+                         if word in first_name_set and word != last_name and len(word) > 2]
             if candidate:
                 row["initials"] = candidate[0]
         return row
@@ -626,6 +634,7 @@ def run_pipeline(
     reporter.capture(12, "Double-count resolution", surname_list)
 
     # Checkpoint
+    surname_list = line_processing.clear_stale_spans(surname_list)
     aaa_6_checkpoint = _ckpt("aaa_6_final.csv")
     surname_list.to_csv(aaa_6_checkpoint, index=False)
     surname_list = pd.read_csv(aaa_6_checkpoint).fillna("")
@@ -658,11 +667,15 @@ def run_pipeline(
     # STEP 14 – Final output
     # ================================================================
     print("[Step 14/14] Writing final output ...")
+    surname_list = line_processing.clear_stale_spans(surname_list)
     final_set = surname_list[[
         "page", "column", "row", "line", "line_complete", "index", "split",
         "firm_dummy", "estate_dummy", "last_name", "best_match", "initials",
         "occ_reg", "occ_reg_2", "municipality", "parish", "matched_parish",
         "unique_key", "income", "income_1", "income_2",
+        "last_name_start", "last_name_end", "initials_start", "initials_end",
+        "occ_reg_start", "occ_reg_end", "parish_start", "parish_end",
+        "income_start", "income_end",
     ]]
     reporter.capture(14, "Final output", final_set)
     final_csv = _out(f"{output_prefix}.csv")
@@ -693,6 +706,16 @@ def main() -> None:
         default=None,
         help="Optional reports directory (default: <out-dir>/reports).",
     )
+    parser.add_argument(
+        "--match-cache",
+        default=None,
+        help="Optional SQLite file caching last-name matches across runs.",
+    )
+    parser.add_argument(
+        "--match-batch",
+        action="store_true",
+        help="Score last names in batches with rapidfuzz cdist instead of row by row.",
+    )
     args = parser.parse_args()
     run_pipeline(
         input_csv=args.input,
@@ -700,6 +723,8 @@ def main() -> None:
         output_prefix=args.output_prefix,
         checkpoint_prefix=args.checkpoint_prefix,
         report_dir=args.report_dir,
+        match_cache_path=args.match_cache,
+        match_batch=args.match_batch,
     )
 
 
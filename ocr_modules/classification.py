@@ -16,7 +16,7 @@ import re
 import string
 import pandas as pd
 
-from .config import FIRM_PATTERN, INITIALS_PATTERN, CITIES_PAR
+from .config import FIRM_MATCHER, INITIALS_PATTERN, CITIES_PAR
 
 
 # ── Determine pages to cut ──────────────────────────────────────────────
@@ -326,7 +326,7 @@ def potential_FH(df, surname_list, certain):
 
         if ((line[0].isupper() or re.match(r"(von\s|de\s)", line))
                 and re.search(r'[A-Za-z]', line)
-                and (re.search(INITIALS_PATTERN, line) or re.search(FIRM_PATTERN, line))
+                and (re.search(INITIALS_PATTERN, line) or FIRM_MATCHER.has_match(line))
                 and any(int(n) > 1000 for n in re.findall(r'\d+', next_line))
                 and line[0:2] != next_line[0:2]
                 and split not in [2] and len(line) > 8):
@@ -6,6 +6,8 @@ All hard-coded patterns and look-up tables live here so that every other
 module can simply ``from ocr_modules.config import …``.
 """
 
+from .utils import PrefilteredPattern
+
 # ── Firm regex pattern ──────────────────────────────────────────────────
 FIRM_PATTERN = (
     r'Sparkassa|Pharmacia|Produktkompaniet|Norra Frivilliga Arbetshuset'
@@ -48,6 +50,10 @@ FIRM_PATTERN = (
     r"|bank(?![A-Za-z])|L:td|a\.-b\.|akt\.-bol\.|fonden"
 )
 
+# Compiled FIRM_PATTERN with a literal pre-filter; use it instead of
+# ``re.search(FIRM_PATTERN, …)`` / ``str.contains(FIRM_PATTERN)``.
+FIRM_MATCHER = PrefilteredPattern(FIRM_PATTERN)
+
 # ── Estate regex pattern ────────────────────────────────────────────────
 ESTATE_PATTERN = r'st\.-hus|starbh|sterbh|starkbhus|starb-|starb\'h|sta bh'
 
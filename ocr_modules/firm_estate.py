@@ -4,9 +4,17 @@ firm_estate.py – Firm-dummy and estate-dummy token detection.
 """
 
 import re
+import numpy as np
 import pandas as pd
 
-from .config import FIRM_PATTERN, ESTATE_PATTERN
+from .config import FIRM_MATCHER, FIRM_PATTERN, ESTATE_PATTERN
+from .utils import PrefilteredPattern, truncation_closed
+
+_PARENS_RE = re.compile(r'\([^)]*\)')
+_ESTATE_RE = re.compile(ESTATE_PATTERN)
+_ESTATE_EXCLUDE_RE = re.compile(r'starbhusnot\.')
+# Matches a text iff FIRM_PATTERN matches one of its prefixes.
+_FIRM_PREFIX_MATCHER = PrefilteredPattern(truncation_closed(FIRM_PATTERN))
 
 
 # ── Firm token ──────────────────────────────────────────────────────────
@@ -14,11 +22,11 @@ from .config import FIRM_PATTERN, ESTATE_PATTERN
 def firm_token(row):
     """Set ``firm_dummy = 1`` when a firm pattern is found in the line."""
     line = row["line_complete"]
-    if pd.notna(line) and re.search(FIRM_PATTERN, line):
+    if pd.notna(line) and FIRM_MATCHER.has_match(line):
         row["firm_dummy"] = 1
     if "(" in line:
         new_complete_line = re.sub(r'\([^)]*\)', '', line)
-        if not re.search(FIRM_PATTERN, new_complete_line):
+        if not FIRM_MATCHER.has_match(new_complete_line):
             row["firm_dummy"] = 0
     if ")" in line and "(" not in line:
         def strip_parentheses_fragments(s):
@@ -29,11 +37,33 @@ def firm_token(row):
                 s2 = s2.split("(")[0].strip()
             return s2
         new_complete_line_2 = strip_parentheses_fragments(line)
-        if not re.search(FIRM_PATTERN, new_complete_line_2):
+        if not FIRM_MATCHER.has_match(new_complete_line_2):
             row["firm_dummy"] = 0
     return row
 
 
+def firm_dummy(df):
+    """Column-level :func:`firm_token`; returns the new ``firm_dummy`` column.
+
+    Rows without a firm pattern keep their current ``firm_dummy`` value.
+    """
+    lines = df["line_complete"]
+    result = df["firm_dummy"].copy() if "firm_dummy" in df.columns else pd.Series(0, index=df.index)
+    result[FIRM_MATCHER.contains(lines, na=False).to_numpy()] = 1
+
+    has_open = lines.str.contains("(", regex=False, na=False).to_numpy()
+    close_only = lines.str.contains(")", regex=False, na=False).to_numpy() & ~has_open
+    reset = np.zeros(len(df), dtype=bool)
+    # Firm pattern only inside "(...)" does not count ...
+    stripped = lines[has_open].str.replace(_PARENS_RE, "", regex=True)
+    reset[has_open] = ~FIRM_MATCHER.contains(stripped, na=False).to_numpy()
+    # ... nor does one before a dangling ")".
+    tail = lines[close_only].str.split(")").str[-1].str.strip()
+    reset[close_only] = ~FIRM_MATCHER.contains(tail, na=False).to_numpy()
+    result[reset] = 0
+    return result
+
+
 # ── Individual + firm-token adjustment ──────────────────────────────────
 
 def _ind_FT(df, df_death_reg_unacc, surname_list):
@@ -55,15 +85,17 @@ def _ind_FT(df, df_death_reg_unacc, surname_list):
         & (df_copy["line"].str.contains(r'\w+,\s*\b(?:[A-Z]\.)'))
     ]
 
+    register_names = set(df_death_reg_unacc["last_name"].values)
+
     def get_ind_with_FT(row):
         last_name = str(row["last_name"])
         line = row["line"]
         line_complete = row["line_complete"]
 
         if "(" in line_complete:
-            match_original = re.search(FIRM_PATTERN, line_complete)
+            match_original = FIRM_MATCHER.search(line_complete)
             new_complete_line = re.sub(r'\([^)]*\)', '', line_complete)
-            match_clean = re.search(FIRM_PATTERN, new_complete_line)
+            match_clean = FIRM_MATCHER.search(new_complete_line)
             if match_original and not match_clean:
                 row["firm_dummy"] = 0
                 row["change"] = 1
@@ -71,7 +103,7 @@ def _ind_FT(df, df_death_reg_unacc, surname_list):
 
         if last_name.endswith("s"):
             last_name_upd = last_name[:-1]
-            if last_name_upd not in df_death_reg_unacc["last_name"].values:
+            if last_name_upd not in register_names:
                 row["firm_dummy"] = 0
                 row["change"] = 1
                 return row
@@ -90,9 +122,10 @@ def _ind_FT(df, df_death_reg_unacc, surname_list):
         start_pos_occ = line_low.find(row["occ_reg"])
         if start_pos_occ != -1:
             end_pos_occ = start_pos_occ + len(row["occ_reg"]) - 1
-            list_next_word = [line_low[end_pos_occ + 1:x]
-                              for x in range(end_pos_occ + 2, len(line_complete))]
-            if any(re.search(FIRM_PATTERN, x) for x in list_next_word):
+            # A firm name in any prefix of the text after the occupation
+            # (up to, not including, the last character).
+            after_occ = line_low[end_pos_occ + 1:len(line_complete) - 1]
+            if after_occ and _FIRM_PREFIX_MATCHER.has_match(after_occ):
                 row["firm_dummy"] = 0
                 row["change"] = 1
             return row
@@ -120,3 +153,13 @@ def estate_token(row):
     if pd.notna(line) and re.search(ESTATE_PATTERN, line) and not re.search(r'starbhusnot\.', line):
         row["estate_dummy"] = 1
     return row
+
+
+def estate_dummy(df):
+    """Column-level :func:`estate_token`; returns the new ``estate_dummy`` column."""
+    lines = df["line_complete"]
+    result = df["estate_dummy"].copy() if "estate_dummy" in df.columns else pd.Series(0, index=df.index)
+    is_estate = (lines.str.contains(_ESTATE_RE, na=False)
+                 & ~lines.str.contains(_ESTATE_EXCLUDE_RE, na=False))
+    result[is_estate.to_numpy()] = 1
+    return result
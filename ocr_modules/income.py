@@ -4,60 +4,82 @@ income.py – Income extraction, splitting, and line-unification.
 """
 
 import re
+import numpy as np
 import pandas as pd
 
 
 # ── Unite separated lines ───────────────────────────────────────────────
 
 def unite_lines(df_):
-    """Combine first-half (split=1) with its continuation line."""
+    """Combine first-half (split=1) with its continuation line.
+
+    The continuation is the next line, or the one after it when the next
+    line is a lone ``"-"``.  A first half with no continuation -- on the
+    last row, or followed only by a trailing ``"-"`` -- keeps its own line.
+    Works on positional arrays rather than one ``iloc`` row at a time.
+    """
     df_["line_complete"] = df_["line"].fillna("")
-    for i in range(len(df_) - 1):
-        if df_.iloc[i]["split"] == 1:
-            current = str(df_.iloc[i]["line"]).rstrip()
-            if str(df_.iloc[i + 1]["line"]) != "-":
-                next_line = str(df_.iloc[i + 1]["line"]).lstrip()
-            else:
-                next_line = str(df_.iloc[i + 2]["line"]).lstrip()
-            df_.at[df_.index[i], "line_complete"] = current + " " + next_line
+    first = np.flatnonzero(df_["split"].to_numpy()[:-1] == 1)
+    if not len(first):
+        return df_
+    text = np.array([str(x) for x in df_["line"]], dtype=object)
+    nxt = first + 1
+    nxt[text[nxt] == "-"] += 1
+    has_next = nxt < len(df_)
+    first, nxt = first[has_next], nxt[has_next]
+    combined = [current.rstrip() + " " + next_line.lstrip()
+                for current, next_line in zip(text[first], text[nxt])]
+    df_.iloc[first, df_.columns.get_loc("line_complete")] = combined
     return df_
 
 
 # ── Extract raw income string ───────────────────────────────────────────
 
+def _income_until_punct(s):
+    """Walk backwards from the end of *s* collecting the income; returns
+    ``(income, end)`` with *end* just past its last digit, or ``(None, -1)``."""
+    i = len(s) - 1
+    income_ = []
+    started = False
+    end = -1
+    while i >= 0:
+        ch = s[i]
+        if ch.isdigit():
+            income_.insert(0, ch)
+            if not started:
+                end = i + 1
+            started = True
+        elif ch in [',', '.'] and i != len(s) - 1:
+            break
+        elif not ch.isalpha() and started:
+            income_.insert(0, ch)
+        elif ch.isalpha():
+            break
+        i -= 1
+    return (''.join(income_), end) if income_ else (None, -1)
+
+
 def extr_inc(row):
-    """Walk backwards from end of ``line_complete`` to extract income digits."""
-    def income_until_punct(s):
-        i = len(s) - 1
-        income_ = []
-        started = False
-        while i >= 0:
-            ch = s[i]
-            if ch.isdigit():
-                income_.insert(0, ch)
-                started = True
-            elif ch in [',', '.'] and i != len(s) - 1:
-                break
-            elif not ch.isalpha() and started:
-                income_.insert(0, ch)
-            elif ch.isalpha():
-                break
-            i -= 1
-        return ''.join(income_) if income_ else None
+    """Walk backwards from end of ``line_complete`` to extract income digits.
 
+    Also records the income's span in ``line_complete`` as ``income_start`` /
+    ``income_end`` (-1 when there is none).
+    """
     if row.get("split") in [0, 1, 3] and isinstance(row.get("line_complete"), str):
-        row["income"] = income_until_punct(row["line_complete"])
+        row["income"], end = _income_until_punct(row["line_complete"])
     else:
-        row["income"] = None
+        row["income"], end = None, -1
     row["income"] = row["income"].lstrip() if isinstance(row["income"], str) else row["income"]
+    # The income is a contiguous run of line_complete ending at its last digit.
+    row["income_start"] = end - len(row["income"]) if end != -1 else -1
+    row["income_end"] = end
     return row
 
 
 # ── Split income into two parts ─────────────────────────────────────────
 
-def split_income(row):
-    """Split a raw income string into ``income_1`` and ``income_2``."""
-    income = row.get("income")
+def _split_income(income):
+    """``(income_1, income_2)``: the first two digit runs of *income*."""
     if not isinstance(income, str):
         income = ""
 
@@ -90,12 +112,77 @@ def split_income(row):
         income_1 = ''.join(buffer)
     elif first_end and buffer:
         income_2 = ''.join(buffer)
+    return income_1, income_2
 
-    row["income_1"] = income_1
-    row["income_2"] = income_2
+
+def split_income(row):
+    """Split a raw income string into ``income_1`` and ``income_2``."""
+    row["income_1"], row["income_2"] = _split_income(row.get("income"))
     return row
 
 
+# ── Column-wise income extraction ───────────────────────────────────────
+
+# On ASCII lines ``_income_until_punct`` reduces to: the run of characters
+# other than letters, ',' and '.' that ends at the last digit (group 1),
+# followed by non-digit filler and at most one final ',' or '.' (group 2).
+_INCOME_TAIL = r'([^A-Za-z,.]*[0-9])([^0-9A-Za-z,.]*[,.]?)\Z'
+_INCOME_PARTS = r'^[^0-9]*([0-9]+)(?:[^0-9]+([0-9]+))?'
+
+
+def extract_income(df_):
+    """Column-wise :func:`extr_inc` + :func:`split_income` + digit filter.
+
+    Sets ``income``, ``income_start``, ``income_end``, ``income_1`` and
+    ``income_2`` as the row-wise functions do.  ASCII lines are parsed with
+    ``Series.str.extract``; ``isdigit`` / ``isalpha`` cover more than
+    ``[0-9]`` / ``[A-Za-z]`` beyond ASCII, so other lines take the
+    character walk.
+    """
+    n = len(df_)
+    lines = (df_["line_complete"] if "line_complete" in df_.columns
+             else pd.Series([None] * n, index=df_.index, dtype=object))
+    is_str = lines.map(lambda x: isinstance(x, str)).to_numpy(dtype=bool)
+    eligible = is_str & (df_["split"].isin([0, 1, 3]).to_numpy(dtype=bool)
+                         if "split" in df_.columns else np.zeros(n, dtype=bool))
+    is_ascii = eligible & lines.map(lambda x: isinstance(x, str) and x.isascii()).to_numpy(dtype=bool)
+
+    income = np.full(n, None, dtype=object)
+    end = np.full(n, -1, dtype=np.int64)
+    tail = lines[is_ascii].astype(object).str.extract(_INCOME_TAIL)
+    found = tail[0].notna().to_numpy(dtype=bool)
+    pos = np.flatnonzero(is_ascii)[found]
+    income[pos] = tail[0].to_numpy()[found]
+    end[pos] = ([len(line) for line in lines.iloc[pos]]
+                - tail[1].str.len().to_numpy()[found])
+    for p in np.flatnonzero(eligible & ~is_ascii):
+        income[p], end[p] = _income_until_punct(lines.iat[p])
+
+    has_income = np.array([isinstance(x, str) for x in income], dtype=bool)
+    income[has_income] = [x.lstrip() for x in income[has_income]]
+    start = np.full(n, -1, dtype=np.int64)
+    start[has_income] = end[has_income] - [len(x) for x in income[has_income]]
+
+    income_1 = np.full(n, "", dtype=object)
+    income_2 = np.full(n, "", dtype=object)
+    ascii_income = has_income & np.array([isinstance(x, str) and x.isascii() for x in income],
+                                         dtype=bool)
+    parts = pd.Series(income[ascii_income], dtype=object).str.extract(_INCOME_PARTS).fillna("")
+    income_1[ascii_income] = parts[0].to_numpy()
+    income_2[ascii_income] = parts[1].to_numpy()
+    for p in np.flatnonzero(has_income & ~ascii_income):
+        income_1[p], income_2[p] = _split_income(income[p])
+
+    df_["income"] = income
+    df_["income_start"] = start
+    df_["income_end"] = end
+    df_["income_1"] = income_1
+    df_["income_2"] = income_2
+    df_["income"] = df_["income"].apply(
+        lambda x: x if bool(re.search(r'\d', str(x))) else "")
+    return df_
+
+
 # ── Combined income pipeline ────────────────────────────────────────────
 
 def find_income(df_, third_line_func, occ_list):
@@ -111,11 +198,5 @@ def find_income(df_, third_line_func, occ_list):
     if df_ is not None and not df_.empty:
         df_ = unite_lines(df_)
         df_ = third_line_func(df_, occ_list)
-        df_["income"] = 0
-        df_ = df_.apply(extr_inc, axis=1)
-        df_["income_1"] = ""
-        df_["income_2"] = ""
-        df_ = df_.apply(split_income, axis=1)
-        df_["income"] = df_["income"].apply(
-            lambda x: x if bool(re.search(r'\d', str(x))) else "")
+        df_ = extract_income(df_)
     return df_
@@ -4,10 +4,10 @@ initials_names.py – Extraction of initials, first names, and second last names
 """
 
 import re
+import numpy as np
 import pandas as pd
-from collections import defaultdict
 
-from .config import FIRM_PATTERN, INITIALS_PATTERN
+from .config import FIRM_MATCHER, INITIALS_PATTERN
 
 
 # ── Initials extraction ─────────────────────────────────────────────────
@@ -37,29 +37,81 @@ def get_initials(row):
     return row
 
 
+_INITIALS_RE = re.compile(INITIALS_PATTERN)
+_COMMA_SPACING_RE = re.compile(r"\s*,\s*")
+_LOWER_RE = re.compile(r'[a-z]')
+_AB_RE = re.compile(r'A\s*\.?\s*-\s*B\.?')
+
+
+def extract_initials(residual_lines):
+    """Column-level :func:`get_initials`; returns the ``initials`` column.
+
+    Lines are split into tokens all at once (exploded, one row per token).
+    A row's initials are the run of tokens matching ``INITIALS_PATTERN``
+    that starts at its first matching token.  The run stops before the
+    first non-matching token, or after a token that holds a comma or is
+    followed by a long lowercase token.
+    """
+    lines = residual_lines.astype(str).str.replace(_COMMA_SPACING_RE, ", ", regex=True)
+    tokens = pd.Series(lines.str.split().to_numpy()).explode().dropna()
+    row = tokens.index.to_numpy()
+    tokens = tokens.reset_index(drop=True)
+
+    same_row_next = np.r_[row[1:] == row[:-1], False]
+    is_init = tokens.str.contains(_INITIALS_RE).to_numpy(dtype=bool)
+    long_lower = ((tokens.str.len() > 4)
+                  & tokens.str.contains(_LOWER_RE)).to_numpy(dtype=bool)
+    stop_after = is_init & (tokens.str.contains(",", regex=False).to_numpy(dtype=bool)
+                            | (np.r_[long_lower[1:], False] & same_row_next))
+    stop_before = np.r_[False, stop_after[:-1] & same_row_next[:-1]]
+
+    started = pd.Series(is_init).groupby(row).cummax().to_numpy(dtype=bool)
+    ended = pd.Series((started & ~is_init) | stop_before).groupby(row).cumsum().to_numpy() > 0
+    keep = is_init & ~ended
+
+    joined = tokens[keep].groupby(row[keep], sort=False).agg(" ".join)
+    initials = np.full(len(lines), "", dtype=object)
+    initials[joined.index.to_numpy(dtype=int)] = joined.to_numpy()
+    initials = pd.Series(initials, index=residual_lines.index)
+    return (initials.str.replace(",", "", regex=False)
+            .str.replace(_AB_RE, "", regex=True))
+
+
 # ── First-name detection ────────────────────────────────────────────────
 
-def build_prefix_dict(first_names, prefix_len=2):
-    prefix_dict = defaultdict(list)
-    for name in first_names:
-        prefix_dict[name[:prefix_len]].append(name)
-    return prefix_dict
-
-
-def first_name(df, first_names, prefix_dict):
-    """Detect first names among words not yet captured as initials."""
-    idx_list = df.index.to_list()
-    for pos, idx in enumerate(idx_list):
-        initials = df.at[idx, "initials"]
-        line = df.at[idx, "line"].replace(",", "")
-        last_name = df.at[idx, "last_name"]
-
-        if initials == "" and not re.search(FIRM_PATTERN, line):
-            for word in line.split()[:-1]:
-                candidates = prefix_dict.get(word[:2], [])
-                if word in candidates and word != last_name:
-                    df.at[idx, "initials"] = word
-                    break
+def build_first_name_set(first_names):
+    """Hashed set of the first names, for O(1) membership tests."""
+    return frozenset(name for name in first_names if isinstance(name, str))
+
+
+def first_name(df, first_names, *, first_name_set=None):
+    """Detect first names among words not yet captured as initials.
+
+    For rows without initials and without a firm pattern, the first word
+    of the line (commas removed, last word excluded) that is a first name
+    and not the row's last name becomes ``initials``.  Works on all rows at
+    once over the exploded words.
+
+    *first_name_set* (see :func:`build_first_name_set`) is keyword-only:
+    the third positional argument used to be the prefix dict, which is no
+    longer needed.
+    """
+    if first_name_set is None:
+        first_name_set = build_first_name_set(first_names)
+    pos = np.flatnonzero((df["initials"] == "").to_numpy())
+    lines = df["line"].iloc[pos].str.replace(",", "", regex=False)
+    no_firm = ~FIRM_MATCHER.contains(lines, na=False).to_numpy()
+    pos, lines = pos[no_firm], lines[no_firm]
+
+    words = pd.Series(lines.str.split().str[:-1].to_numpy(), index=pos).explode()
+    last_names = df["last_name"].to_numpy()[words.index.to_numpy()]
+    is_first = words.isin(first_name_set).to_numpy() & (words.to_numpy() != last_names)
+    found = words[is_first].groupby(level=0, sort=False).first()
+
+    if len(found):
+        initials = df["initials"].to_numpy(copy=True)
+        initials[found.index.to_numpy()] = found.to_numpy()
+        df["initials"] = initials
     return df
 
 
@@ -72,7 +124,7 @@ def second_last_name(row):
 
     if remaining_line_split:
         first_token = remaining_line_split[0].replace(",", "")
-        if ":" in first_token and re.search(r'[A-Z]', first_token) and not re.search(FIRM_PATTERN, first_token):
+        if ":" in first_token and re.search(r'[A-Z]', first_token) and not FIRM_MATCHER.has_match(first_token):
             row["second_last_name"] = first_token
 
     return row
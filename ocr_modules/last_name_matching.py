@@ -17,14 +17,115 @@ Also handles:
 
 import re
 import os
+import bisect
+import time
 import multiprocessing as mp
 
 import numpy as np
 import pandas as pd
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
 
-from .utils import complete_first_word, fuzzy_match_rapidfuzz
-from .config import FIRM_PATTERN, NO_OCC_LIST
+from .utils import AhoCorasick, FuzzyMatcher, complete_first_word
+from .config import FIRM_MATCHER, NO_OCC_LIST
+from .match_cache import RESULT_COLUMNS
+
+
+# ── Surname index ───────────────────────────────────────────────────────
+
+class SurnameIndex:
+    """Look-up tables over the death-register surnames, built once per run.
+
+    ``rank`` maps every surname to its first position in the register so
+    that index look-ups reproduce the priority of a linear scan over
+    ``df_death_reg_unacc``.  ``by_length`` holds the names longest-first
+    (register order within a length) and ``by_prefix`` the same ordering
+    bucketed by the first two characters, which is what the A3 / A4 scans
+    walk through.
+    """
+
+    def __init__(self, names):
+        self.names = [name for name in names if isinstance(name, str)]
+        self.rank = {}
+        for pos, name in enumerate(self.names):
+            self.rank.setdefault(name, pos)
+
+        self.by_length = sorted(self.names, key=len, reverse=True)
+        self._neg_lengths = [-len(name) for name in self.by_length]
+        self.length_bands = {}
+        for pos, name in enumerate(self.by_length):
+            start, _end = self.length_bands.get(len(name), (pos, pos))
+            self.length_bands[len(name)] = (start, pos + 1)
+
+        buckets = {}
+        for name in self.by_length:
+            buckets.setdefault(name[:2], []).append(name)
+        self.by_prefix = {
+            cut: (bucket, [-len(name) for name in bucket])
+            for cut, bucket in buckets.items()
+        }
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def shortest(self):
+        """Last name visited by a full longest-first scan ("" if empty)."""
+        return self.by_length[-1] if self.by_length else ""
+
+    def exact_match(self, line):
+        """Return the register name an A2 scan of *line* would pick, or None."""
+        tokens = line.split(",") + line.split() + line.split(".")
+        best = None
+        for token in tokens:
+            pos = self.rank.get(token)
+            if (pos is not None and len(token) > 2 and line.startswith(token)
+                    and (best is None or pos < self.rank[best])):
+                best = token
+        return best
+
+    def prefix_candidates(self, cut, max_len):
+        """Names starting with *cut* and no longer than *max_len*, longest first."""
+        if len(cut) == 2:
+            bucket, neg_lengths = self.by_prefix.get(cut, ([], []))
+            return bucket[bisect.bisect_left(neg_lengths, -max_len):]
+        return [name for name in self.length_candidates(max_len) if name.startswith(cut)]
+
+    def length_candidates(self, max_len, min_len=0):
+        """Names with ``min_len <= len <= max_len``, longest first."""
+        start = bisect.bisect_left(self._neg_lengths, -max_len)
+        end = bisect.bisect_right(self._neg_lengths, -min_len) if min_len > 0 else len(self.by_length)
+        return self.by_length[start:end]
+
+    def length_groups(self, max_len, min_len=0):
+        """Yield ``(length, names)`` for every length band in range, longest first."""
+        for length in sorted(self.length_bands, reverse=True):
+            if min_len <= length <= max_len:
+                start, end = self.length_bands[length]
+                yield length, self.by_length[start:end]
+
+
+def build_surname_index(df_death_reg_unacc):
+    """Build a :class:`SurnameIndex` from the death register (register order)."""
+    return SurnameIndex(df_death_reg_unacc["last_name"].dropna().values)
+
+
+class DirtyNameMatcher:
+    """First dirty name (in list order) contained in a line, in one pass."""
+
+    def __init__(self, dirty_last_names_list):
+        pairs = list(dirty_last_names_list.itertuples(index=False, name=None))
+        self._clean = [clean for _dirty, clean in pairs]
+        self._automaton = AhoCorasick(dirty for dirty, _clean in pairs)
+
+    def match(self, line):
+        """Clean name of the first dirty name found in *line*, or ``None``."""
+        pid = self._automaton.first(line)
+        return None if pid is None else self._clean[pid]
+
+
+def build_dirty_matcher(dirty_last_names_list):
+    """Build a :class:`DirtyNameMatcher` from the dirty-name list."""
+    return DirtyNameMatcher(dirty_last_names_list)
 
 
 # ── helpers ─────────────────────────────────────────────────────────────
@@ -49,92 +150,97 @@ def adj_unmatch(row, df_death_reg_unacc):
 
 # ── A2: perfect match ──────────────────────────────────────────────────
 
-def perf_match(row, df_death_reg_unacc):
-    """Exact-token match of the line start against the death register."""
+def perf_match(row, df_death_reg_unacc, surname_index=None):
+    """Exact-token match of the line start against the death register.
+
+    Pass a prebuilt *surname_index* (see :func:`build_surname_index`) to
+    avoid rebuilding it from ``df_death_reg_unacc`` on every call.
+    """
     if isinstance(row["line"], str):
-        tokens = row["line"].split(",") + row["line"].split() + row["line"].split(".")
-        line = row["line"]
-        for name in df_death_reg_unacc["last_name"].dropna().values:
-            if name in tokens and line.startswith(name) and len(name) > 2:
-                row["best_match"] = name
-                row["last_name"] = name
-                row["similarity"] = 100
-                row["index"] = "A2"
-                row["matched"] = True
-                break
+        if surname_index is None:
+            surname_index = build_surname_index(df_death_reg_unacc)
+        name = surname_index.exact_match(row["line"])
+        if name is not None:
+            row["best_match"] = name
+            row["last_name"] = name
+            row["similarity"] = 100
+            row["index"] = "A2"
+            row["matched"] = True
     return row
 
 
 # ── A3 / A4: fuzzy match ───────────────────────────────────────────────
 
 def fuzzy_alt(row, df_death_reg_unacc, dirty_last_names_list,
-              min_score=85, mid_score=90):
-    """Two-pass fuzzy match (prefix-filtered, then full scan)."""
+              min_score=85, mid_score=90, surname_index=None, dirty_matcher=None):
+    """Two-pass fuzzy match (prefix-filtered, then full scan).
+
+    Both passes read their candidates from *surname_index* (built from
+    ``df_death_reg_unacc`` when not given).  The full scan only walks the
+    names whose length is within the A4 tolerance of the line's first word;
+    shorter names are checked in bulk and only walked when one of them
+    could still displace the best match.
+
+    The dirty-name fallback uses *dirty_matcher* (built from
+    ``dirty_last_names_list`` when not given).
+    """
+    if surname_index is None:
+        surname_index = build_surname_index(df_death_reg_unacc)
+    if dirty_matcher is None:
+        dirty_matcher = build_dirty_matcher(dirty_last_names_list)
     line = row["line"]
     cut = line[:2] if isinstance(line, str) else ""
-    pairings = df_death_reg_unacc[df_death_reg_unacc["last_name"].notna()]
-    pairings = pairings[pairings["last_name"].str.startswith(cut)]
-    pairings = pairings.sort_values(by="last_name", key=lambda x: x.str.len(), ascending=False)
-
-    best_score = 0
-    best_name = None
 
     # --- first pass: prefix-filtered ---
-    for last_name in pairings["last_name"]:
-        if len(last_name) > len(line):
-            continue
-        compare_part = line[:len(last_name)]
-        score = fuzz.token_sort_ratio(last_name, compare_part)
-        if score > best_score:
-            best_score = score
-            best_name = last_name
-            if best_score > mid_score and _boundary_ok(line, compare_part):
-                row["last_name"] = complete_first_word(line[:len(best_name)], line).rstrip('., ').strip()
-                break
+    best_score, best_name, _stop = _fuzzy_scan(
+        line, surname_index.prefix_candidates(cut, len(line)), mid_score=mid_score)
 
     if best_score >= mid_score:
-        row["matched"] = True
-        row["index"] = "A3"
-        row["best_match"] = best_name
-        row["similarity"] = best_score
-        row["last_name"] = complete_first_word(line[:len(best_name)], line).rstrip('., ').strip()
+        fields = _a3_fields(line, best_score, best_name)
     else:
-        # --- second pass: full scan ---
-        best_score = 0
-        best_name = None
-        for last_name in df_death_reg_unacc["last_name"].dropna().sort_values(
-                key=lambda x: x.str.len(), ascending=False):
-            if len(last_name) > len(line):
-                continue
-            compare_part = line[:len(last_name)]
-            score = fuzz.token_sort_ratio(last_name, compare_part)
-            if score > best_score:
-                best_score = score
-                best_name = last_name
-                if best_score > mid_score and _boundary_ok(line, compare_part):
-                    row["last_name"] = complete_first_word(line[:len(best_name)], line).rstrip('., ').strip()
-                    break
-
-        complete_word = complete_first_word(line[:len(last_name)], line)
-
-        if best_score >= min_score and abs(len(complete_word) - len(best_name)) <= 5:
-            row["matched"] = True
-            row["index"] = "A4"
-            row["best_match"] = best_name
-            row["similarity"] = best_score
-            row["last_name"] = complete_first_word(line[:len(best_name)], line).rstrip('., ').strip()
-        else:
-            row["matched"] = False
-            row["index"] = "A5"
-            row["best_match"] = ""
-            row["similarity"] = 0
-            row["last_name"] = ""
+        # --- second pass: full scan (length band first) ---
+        first_word = complete_first_word(line[:len(surname_index.shortest)], line)
+        min_len = len(first_word) - 5
+        best_score, best_name, stop = _fuzzy_scan(
+            line, surname_index.length_candidates(len(line), min_len), mid_score=mid_score)
+        if not stop:
+            best_score, best_name, stop = _fuzzy_scan_groups(
+                line, surname_index.length_groups(min(len(line), min_len - 1)),
+                best_score, best_name, mid_score=mid_score)
+        fields = _a4_fields(line, best_score, best_name, stop, first_word, min_score)
+
+    fields = _validated_fields(line, fields, dirty_matcher)
+    row["matched"], row["index"], row["best_match"], row["similarity"], row["last_name"] = fields
+    return row
+
+
+_UNMATCHED = (False, "A5", "", 0, "")
+
+
+def _a3_fields(line, best_score, best_name):
+    """``(matched, index, best_match, similarity, last_name)`` for an A3 hit."""
+    last_name = complete_first_word(line[:len(best_name)], line).rstrip('., ').strip()
+    return True, "A3", best_name, best_score, last_name
+
+
+def _a4_fields(line, best_score, best_name, stopped, first_word, min_score=85):
+    """A4 fields when the full-scan result passes the length tolerance, else A5."""
+    complete_word = (complete_first_word(line[:len(best_name)], line)
+                     if stopped else first_word)
+    if best_score >= min_score and abs(len(complete_word) - len(best_name)) <= 5:
+        last_name = complete_first_word(line[:len(best_name)], line).rstrip('., ').strip()
+        return True, "A4", best_name, best_score, last_name
+    return _UNMATCHED
+
+
+def _validated_fields(line, fields, dirty_matcher):
+    """Post-validate an A3/A4 result and fall back to the dirty-name list."""
+    index = fields[1]
 
     # --- post-validation for A3/A4 ---
-    if row["index"] in ["A3", "A4"]:
+    if index in ["A3", "A4"]:
         try:
-            line = row.get("line", "")
-            best_name = row.get("best_match", "")
+            best_name = fields[2]
             partial = line[:len(best_name)] if best_name else ""
             completed = complete_first_word(partial, line) or ""
             remaining = line[line.find(partial) + len(partial):] if partial in line else ""
@@ -144,35 +250,26 @@ def fuzzy_alt(row, df_death_reg_unacc, dirty_last_names_list,
             comma_ok = min(comma_dist, space_dist, dot_dist) == 1
             comp_name = len(completed) > len(best_name)
             if comp_name and not comma_ok:
-                row["matched"], row["index"] = False, "A5"
-                row["best_match"], row["similarity"], row["last_name"] = "", 0, ""
+                fields = _UNMATCHED
         except Exception:
-            row["matched"], row["index"] = False, "A5"
-            row["best_match"], row["similarity"], row["last_name"] = "", 0, ""
+            fields = _UNMATCHED
 
-    if row["index"] in ["A3", "A4"]:
-        line = row.get("line", "")
-        if re.search(FIRM_PATTERN, line):
-            row["matched"], row["index"] = False, "A5"
-            row["best_match"], row["similarity"], row["last_name"] = "", 0, ""
+    if fields[1] in ["A3", "A4"] and FIRM_MATCHER.has_match(line):
+        fields = _UNMATCHED
 
     # --- dirty-name fallback ---
-    if row["index"] == "A5":
-        for dirty, clean in dirty_last_names_list.itertuples(index=False):
-            if dirty in row["line"]:
-                row["matched"]    = True
-                row["index"]      = "A2"
-                row["best_match"] = clean
-                row["similarity"] = 100
-                row["last_name"]  = clean
-                break
+    if fields[1] == "A5":
+        clean = dirty_matcher.match(line)
+        if clean is not None:
+            return True, "A2", clean, 100, clean
 
-    return row
+    return fields
 
 
 # ── A1 → A4 orchestrator ───────────────────────────────────────────────
 
-def alt_algorithm(row_, df_death_reg_unacc, dirty_last_names_list):
+def alt_algorithm(row_, df_death_reg_unacc, dirty_last_names_list,
+                  surname_index=None, dirty_matcher=None):
     """Run the full last-name matching cascade (A1→A2→A3/A4)."""
     # A1: non-occupation word
     if any(row_["line"].startswith(word) for word in NO_OCC_LIST):
@@ -182,20 +279,194 @@ def alt_algorithm(row_, df_death_reg_unacc, dirty_last_names_list):
 
     # A2: perfect match
     if not row_["matched"]:
-        row_ = perf_match(row_, df_death_reg_unacc)
+        row_ = perf_match(row_, df_death_reg_unacc, surname_index)
 
     # A3 / A4: fuzzy match
     if not row_["matched"]:
-        row_ = fuzzy_alt(row_, df_death_reg_unacc, dirty_last_names_list)
+        row_ = fuzzy_alt(row_, df_death_reg_unacc, dirty_last_names_list,
+                         surname_index=surname_index, dirty_matcher=dirty_matcher)
 
     return row_
 
 
+# ── Batch matching (A1 → A5 over a whole frame) ───────────────────────
+
+def batch_alt_algorithm(surname_list, df_death_reg_unacc, dirty_last_names_list,
+                        surname_index=None, workers=-1, chunk_size=512,
+                        min_score=85, mid_score=90, dirty_matcher=None):
+    """Frame-level equivalent of applying :func:`alt_algorithm` row by row.
+
+    A1 and A2 are resolved per line; the remaining lines are grouped by
+    prefix (A3) or taken together (A4) and scored against their candidate
+    slices of the register with ``rapidfuzz.process.cdist``, one matrix per
+    candidate length.  The longest-first scan is then replayed on each row of
+    the score matrix, so the A2-A5 labels are the same as the row-wise path.
+
+    Parameters
+    ----------
+    workers : int
+        Threads used by ``cdist`` (``-1`` = all cores).
+    chunk_size : int
+        Lines scored per matrix, bounding memory on large registers.
+    """
+    if surname_index is None:
+        surname_index = build_surname_index(df_death_reg_unacc)
+    if dirty_matcher is None:
+        dirty_matcher = build_dirty_matcher(dirty_last_names_list)
+    df = surname_list.copy()
+    lines = df["line"].tolist()
+    matched = df["matched"].tolist()
+    results = {}
+
+    fuzzy_pos = []
+    for pos, line in enumerate(lines):
+        if any(line.startswith(word) for word in NO_OCC_LIST):
+            results[pos] = (True, "A1", np.nan, np.nan, None)
+            continue
+        if not matched[pos]:
+            name = surname_index.exact_match(line) if isinstance(line, str) else None
+            if name is not None:
+                results[pos] = (True, "A2", name, 100, name)
+                continue
+        if not matched[pos]:
+            fuzzy_pos.append(pos)
+
+    # --- A3: prefix buckets ---
+    by_cut = {}
+    for pos in fuzzy_pos:
+        by_cut.setdefault(lines[pos][:2], []).append(pos)
+    a4_pos = []
+    for cut, positions in by_cut.items():
+        if len(cut) == 2:
+            names = surname_index.by_prefix.get(cut, ([], []))[0]
+            scans = _batch_fuzzy_scan([lines[pos] for pos in positions], names,
+                                      mid_score, workers, chunk_size)
+        else:
+            scans = [_fuzzy_scan(lines[pos], surname_index.prefix_candidates(cut, len(lines[pos])),
+                                 mid_score=mid_score) for pos in positions]
+        for pos, (best_score, best_name, _stop) in zip(positions, scans):
+            if best_score >= mid_score:
+                results[pos] = _a3_fields(lines[pos], best_score, best_name)
+            else:
+                a4_pos.append(pos)
+
+    # --- A4: full register ---
+    scans = _batch_fuzzy_scan([lines[pos] for pos in a4_pos], surname_index.by_length,
+                              mid_score, workers, chunk_size, score_cutoff=min_score)
+    for pos, (best_score, best_name, stop) in zip(a4_pos, scans):
+        line = lines[pos]
+        first_word = complete_first_word(line[:len(surname_index.shortest)], line)
+        results[pos] = _a4_fields(line, best_score, best_name, stop, first_word, min_score)
+
+    for pos in fuzzy_pos:
+        results[pos] = _validated_fields(lines[pos], results[pos], dirty_matcher)
+
+    columns = {col: (df[col].tolist() if col in df.columns else [np.nan] * len(df))
+               for col in ["matched", "index", "best_match", "similarity", "last_name"]}
+    for pos, fields in results.items():
+        if fields[1] == "A1":
+            columns["matched"][pos], columns["index"][pos] = True, "A1"
+            continue
+        for col, value in zip(columns, fields):
+            columns[col][pos] = value
+    for col, values in columns.items():
+        df[col] = values
+    return df
+
+
+def _batch_fuzzy_scan(lines, names, mid_score=90, workers=-1, chunk_size=512,
+                      score_cutoff=None):
+    """:func:`_fuzzy_scan` for many lines against one longest-first name list.
+
+    Scores below *score_cutoff* (default *mid_score*) are zeroed by
+    ``cdist``; they can neither stop the scan nor be accepted afterwards.
+    """
+    if score_cutoff is None:
+        score_cutoff = mid_score
+    bands = []
+    for pos, name in enumerate(names):
+        if bands and bands[-1][0] == len(name):
+            bands[-1][2] = pos + 1
+        else:
+            bands.append([len(name), pos, pos + 1])
+    neg_lengths = [-len(name) for name in names]
+
+    order = sorted(range(len(lines)), key=lambda i: len(lines[i]), reverse=True)
+    results = [None] * len(lines)
+    for chunk_start in range(0, len(order), chunk_size):
+        chunk = [lines[i] for i in order[chunk_start:chunk_start + chunk_size]]
+        matrices = []
+        for length, start, end in bands:
+            n_rows = sum(1 for line in chunk if len(line) >= length)
+            if n_rows:
+                matrices.append(process.cdist(
+                    [line[:length] for line in chunk[:n_rows]], names[start:end],
+                    scorer=fuzz.token_sort_ratio, score_cutoff=score_cutoff,
+                    dtype=np.float64, workers=workers))
+            else:
+                matrices.append(None)
+        for row, line in enumerate(chunk):
+            first = bisect.bisect_left(neg_lengths, -len(line))
+            segments = [matrix[row] for (length, _s, _e), matrix in zip(bands, matrices)
+                        if length <= len(line)]
+            scores = np.concatenate(segments) if segments else np.zeros(0)
+            results[order[chunk_start + row]] = _replay_scan(
+                line, names[first:], scores, mid_score=mid_score)
+    return results
+
+
+def _replay_scan(line, names, scores, best_score=0, best_name=None, mid_score=90):
+    """Result of :func:`_fuzzy_scan` given the scores it would compute."""
+    if len(scores):
+        running = np.maximum.accumulate(np.concatenate(([best_score], scores)))[:-1]
+        for pos in np.flatnonzero(scores > running):
+            best_score, best_name = float(scores[pos]), names[pos]
+            if best_score > mid_score and _boundary_ok(line, line[:len(best_name)]):
+                return best_score, best_name, True
+    return best_score, best_name, False
+
+
 # ── V. and dash handling ───────────────────────────────────────────────
 
+class _LengthBandMatchers:
+    """A :class:`FuzzyMatcher` per query length, over the names whose length
+    is within one of it (built on first use)."""
+
+    def __init__(self, names):
+        self._names = names
+        self._lengths = names.str.len()
+        self._by_length = {}
+
+    def match(self, query):
+        matcher = self._by_length.get(len(query))
+        if matcher is None:
+            band = self._names[abs(self._lengths - len(query)) <= 1]
+            matcher = self._by_length[len(query)] = FuzzyMatcher(band)
+        return matcher.match(query)
+
+
+class VDashMatchers:
+    """Register matchers for :func:`fuzzy_v_dot_and_dash_LN`.
+
+    ``von`` covers the ``von …`` names and ``register`` all names; both
+    pick the ±1 length band of the query, as the row-wise filters did.
+    """
+
+    def __init__(self, df_death_reg_unacc):
+        names = df_death_reg_unacc["last_name"]
+        self.von = _LengthBandMatchers(names[names.str.startswith("von")])
+        self.register = _LengthBandMatchers(names)
+
+
 def fuzzy_v_dot_and_dash_LN(row, surname_list, df_death_reg_unacc,
-                            min_score=86, mid_score=90):
-    """Handle ``V.`` prefix (→ von) and hyphenated last names."""
+                            min_score=86, mid_score=90, v_dash_matchers=None):
+    """Handle ``V.`` prefix (→ von) and hyphenated last names.
+
+    Pass a shared *v_dash_matchers* (see :class:`VDashMatchers`) to reuse
+    the register matchers and their caches across rows.
+    """
+    if v_dash_matchers is None:
+        v_dash_matchers = VDashMatchers(df_death_reg_unacc)
     line = row["line"]
     line_split = line.split(",")
     last_name = line_split[0]
@@ -204,9 +475,7 @@ def fuzzy_v_dot_and_dash_LN(row, surname_list, df_death_reg_unacc,
     if line.startswith("V.") and row["last_name"] == "":
         line_v = line.replace("V.", "von")
         ln = line_v.split(",")[0]
-        df_unacc_von = df_death_reg_unacc[df_death_reg_unacc["last_name"].str.startswith("von")]
-        df_unacc_von = df_unacc_von[abs(df_unacc_von["last_name"].str.len() - len(ln)) <= 1]
-        best_fit, score, _idx = fuzzy_match_rapidfuzz(ln, df_unacc_von["last_name"])
+        best_fit, score, _idx = v_dash_matchers.von.match(ln)
         if min_score <= score:
             row["best_match"] = best_fit
             ln = ln.replace("von", "V.")
@@ -231,10 +500,7 @@ def fuzzy_v_dot_and_dash_LN(row, surname_list, df_death_reg_unacc,
             and len(last_name.split()) == 1):
         last_name_splitted = last_name.split("-")
         for comp_ in last_name_splitted:
-            death_reg_comp_ = df_death_reg_unacc[
-                abs(df_death_reg_unacc["last_name"].str.len() - len(comp_)) <= 1
-            ]
-            best_fit, score, _idx = fuzzy_match_rapidfuzz(comp_, death_reg_comp_["last_name"])
+            best_fit, score, _idx = v_dash_matchers.register.match(comp_)
             if min_score <= score:
                 row["best_match"] = str(row["best_match"]) + ' ' + best_fit
                 row["last_name"] = str(row["last_name"]) + " " + comp_
@@ -266,19 +532,113 @@ def _boundary_ok(line, compare_part):
     return abs(min(space_d, comma_d, dot_d)) == 0
 
 
+def _fuzzy_scan(line, names, best_score=0, best_name=None, mid_score=90):
+    """Longest-first fuzzy scan of *line* against *names*.
+
+    Returns ``(best_score, best_name, stopped)``; the scan stops at the first
+    new best above *mid_score* that ends on a word boundary.
+    """
+    for last_name in names:
+        compare_part = line[:len(last_name)]
+        score = fuzz.token_sort_ratio(last_name, compare_part)
+        if score > best_score:
+            best_score = score
+            best_name = last_name
+            if best_score > mid_score and _boundary_ok(line, compare_part):
+                return best_score, best_name, True
+    return best_score, best_name, False
+
+
+def _fuzzy_scan_groups(line, groups, best_score=0, best_name=None, mid_score=90):
+    """Same result as :func:`_fuzzy_scan` over equal-length name groups.
+
+    Every name of a group is compared with the same line prefix, so each
+    group is scored inside rapidfuzz and only the names that beat the
+    running best are inspected from Python.
+    """
+    for length, names in groups:
+        compare_part = line[:length]
+        if _boundary_ok(line, compare_part):
+            cutoff = max(best_score, mid_score)
+            hits = [hit for hit in process.extract(
+                compare_part, names, scorer=fuzz.token_sort_ratio,
+                score_cutoff=cutoff, limit=None) if hit[1] > cutoff]
+            if hits:
+                name, score, _pos = min(hits, key=lambda hit: hit[2])
+                return score, name, True
+        match = process.extractOne(
+            compare_part, names, scorer=fuzz.token_sort_ratio, score_cutoff=best_score)
+        if match is not None and match[1] > best_score:
+            best_name, best_score, _pos = match
+    return best_score, best_name, False
+
+
 # ── parallel helpers ──────────────────────────────────────────────────
 
-def _worker_apply_alt_algorithm(args):
-    """Process a chunk of the DataFrame (runs in a child process)."""
-    chunk, df_death_reg_unacc, dirty_last_names_list = args
-    return chunk.apply(
-        lambda row: alt_algorithm(row, df_death_reg_unacc, dirty_last_names_list),
+# Reference data of a pool worker, filled once per process by _init_worker.
+_WORKER_STATE = {}
+
+
+def _init_worker(names, dirty_rows, dirty_columns):
+    """Pool initializer: build the surname index and dirty-name matcher."""
+    _WORKER_STATE["surname_index"] = SurnameIndex(names)
+    dirty_last_names_list = pd.DataFrame(dirty_rows, columns=dirty_columns)
+    _WORKER_STATE["dirty_last_names_list"] = dirty_last_names_list
+    _WORKER_STATE["dirty_matcher"] = build_dirty_matcher(dirty_last_names_list)
+
+
+def _worker_apply_alt_algorithm(task):
+    """Process one ``(chunk_id, chunk)`` task (runs in a child process).
+
+    Returns ``(chunk_id, result, seconds)`` so the parent can put chunks back
+    in order and report how long each one took.
+    """
+    chunk_id, chunk = task
+    surname_index = _WORKER_STATE["surname_index"]
+    dirty_last_names_list = _WORKER_STATE["dirty_last_names_list"]
+    dirty_matcher = _WORKER_STATE["dirty_matcher"]
+    t0 = time.perf_counter()
+    result = chunk.apply(
+        lambda row: alt_algorithm(row, None, dirty_last_names_list,
+                                  surname_index, dirty_matcher),
         axis=1,
     )
+    return chunk_id, result, time.perf_counter() - t0
+
+
+def _estimate_cost(line, surname_index):
+    """Rough relative cost of matching *line*.
+
+    Long lines score against more candidates, and lines whose first two
+    characters have no prefix bucket always fall through to the A4 scan.
+    """
+    if not isinstance(line, str):
+        return 0
+    cost = len(line)
+    if line[:2] not in surname_index.by_prefix:
+        cost *= 4
+    return cost
+
+
+def _schedule_chunks(surname_list, surname_index, chunk_size):
+    """Split rows into small chunks, most expensive first.
+
+    Returns a list of ``(chunk_id, chunk)`` and the row positions in chunk
+    order, used to restore the original order afterwards.
+    """
+    costs = np.array([_estimate_cost(line, surname_index)
+                      for line in surname_list["line"]])
+    order = np.argsort(-costs, kind="stable")
+    tasks = [
+        (chunk_id, surname_list.iloc[order[start:start + chunk_size]])
+        for chunk_id, start in enumerate(range(0, len(order), chunk_size))
+    ]
+    return tasks, order
 
 
 def parallel_alt_algorithm(surname_list, df_death_reg_unacc,
-                           dirty_last_names_list, n_workers=None):
+                           dirty_last_names_list, n_workers=None, batch=False,
+                           chunk_size=256, stats=None, cache=None):
     """Run :func:`alt_algorithm` in parallel across multiple CPU cores.
 
     Parameters
@@ -291,30 +651,103 @@ def parallel_alt_algorithm(surname_list, df_death_reg_unacc,
         Dirty-name → clean-name mapping (read-only).
     n_workers : int, optional
         Number of parallel workers.  Defaults to ``os.cpu_count()``.
+    batch : bool
+        Use :func:`batch_alt_algorithm` (``cdist`` scoring, threaded with
+        *n_workers*) instead of the per-row process pool.
+    chunk_size : int
+        Rows per pool task.  Chunks are handed out most-expensive-first
+        with ``imap_unordered`` so a slow chunk does not hold up the rest.
+    stats : dict, optional
+        Filled with per-chunk wall-clock timings of the process pool.
+    cache : MatchCache, optional
+        Persistent result cache (see :mod:`match_cache`).  Only lines not
+        found in it are matched, each distinct line once.
     """
+    if cache is not None:
+        return _cached_alt_algorithm(
+            surname_list, df_death_reg_unacc, dirty_last_names_list, cache,
+            n_workers=n_workers, batch=batch, chunk_size=chunk_size, stats=stats)
+
     n_rows = len(surname_list)
+    surname_index = build_surname_index(df_death_reg_unacc)
+    if batch:
+        return batch_alt_algorithm(
+            surname_list, df_death_reg_unacc, dirty_last_names_list,
+            surname_index, workers=n_workers or -1,
+            dirty_matcher=build_dirty_matcher(dirty_last_names_list))
+
     if n_workers is None:
         n_workers = os.cpu_count() or 1
     n_workers = max(1, min(n_workers, n_rows))
 
     if n_workers <= 1:
+        dirty_matcher = build_dirty_matcher(dirty_last_names_list)
         return surname_list.apply(
             lambda row: alt_algorithm(
-                row, df_death_reg_unacc, dirty_last_names_list),
+                row, df_death_reg_unacc, dirty_last_names_list,
+                surname_index, dirty_matcher),
             axis=1,
         )
 
-    chunks = np.array_split(surname_list, n_workers)
-    chunks = [c for c in chunks if len(c) > 0]
-
-    args = [
-        (chunk, df_death_reg_unacc, dirty_last_names_list)
-        for chunk in chunks
-    ]
-
-    print(f"  → Distributing {n_rows:,} rows across {len(chunks)} workers ...")
-
-    with mp.Pool(processes=len(chunks)) as pool:
-        results = pool.map(_worker_apply_alt_algorithm, args)
-
-    return pd.concat(results)
+    tasks, order = _schedule_chunks(surname_list, surname_index, chunk_size)
+    n_workers = min(n_workers, len(tasks))
+
+    print(f"  → Distributing {n_rows:,} rows as {len(tasks)} chunks "
+          f"across {n_workers} workers ...")
+
+    # Reference data goes to each worker once (initializer), not per task.
+    dirty_rows = list(dirty_last_names_list.itertuples(index=False, name=None))
+    results = [None] * len(tasks)
+    timings = [0.0] * len(tasks)
+    with mp.Pool(processes=n_workers, initializer=_init_worker,
+                 initargs=(surname_index.names, dirty_rows,
+                           list(dirty_last_names_list.columns))) as pool:
+        for chunk_id, result, seconds in pool.imap_unordered(
+                _worker_apply_alt_algorithm, tasks):
+            results[chunk_id] = result
+            timings[chunk_id] = seconds
+
+    if stats is not None:
+        stats.update({
+            "match_chunks": len(tasks),
+            "match_chunk_size": chunk_size,
+            "match_workers": n_workers,
+            "match_chunk_seconds": [round(t, 4) for t in timings],
+            "match_chunk_seconds_max": round(max(timings), 4),
+            "match_chunk_seconds_sum": round(sum(timings), 4),
+        })
+
+    # Chunks are in cost order; put the rows back in input order.
+    combined = pd.concat(results)
+    return combined.iloc[np.argsort(order, kind="stable")]
+
+
+def _cached_alt_algorithm(surname_list, df_death_reg_unacc, dirty_last_names_list,
+                          cache, **kwargs):
+    """:func:`parallel_alt_algorithm` for the lines missing from *cache*."""
+    lines = surname_list["line"]
+    found = cache.lookup(lines)
+    todo = surname_list[~lines.isin(found.keys())].drop_duplicates(subset="line")
+    print(f"  → Match cache: {len(found):,} lines cached, {len(todo):,} to match ...")
+
+    if len(todo) > 0:
+        matched = parallel_alt_algorithm(
+            todo, df_death_reg_unacc, dirty_last_names_list, **kwargs)
+        cache.store(matched)
+        found.update(cache.lookup(matched["line"]))
+
+    stats = kwargs.get("stats")
+    if stats is not None:
+        stats.update({"match_cache_hits": len(lines.unique()) - len(todo),
+                      "match_cache_misses": len(todo)})
+
+    out = surname_list.copy()
+    fields = [found[line] for line in lines]
+    for pos, col in enumerate(RESULT_COLUMNS):
+        values = [f[pos] for f in fields]
+        if col == "matched":
+            values = [bool(v) for v in values]
+        else:
+            values = [np.nan if v is None else v for v in values]
+        out[col] = values
+    return out
@@ -7,15 +7,20 @@ Covers:
   - Initial "0" → "O" correction
   - Double-dot fix
   - The ``split_line`` algorithm (conditions 1 / 1-bis / 2 / 2-bis / 2-extra)
+  - Page/column-parallel ``split_line`` (``parallel_split_line``)
   - Third-line adjustment
   - Secondary-line adjustments
 """
 
 import re
+import os
 import string
+import multiprocessing as mp
+import numpy as np
 import pandas as pd
 
-from .config import FIRM_PATTERN, INITIALS_PATTERN
+from .config import FIRM_MATCHER, FIRM_PATTERN, INITIALS_PATTERN
+from .utils import AhoCorasick
 
 
 # ── Number / punctuation cleaning ───────────────────────────────────────
@@ -53,18 +58,28 @@ def fix_initials_and_dots(surname_list):
 
 # ── Residual-line extraction ────────────────────────────────────────────
 
+def _leading_cut(text):
+    """Offset the historical leading non-alpha trim cuts *text* at.
+
+    The trim sliced the string it was enumerating, so a run of ``k`` leading
+    non-alpha characters drops ``0 + 1 + … + (k - 1)`` of them rather than
+    ``k``; outputs depend on that, so it is reproduced here.
+    """
+    k = 0
+    for ch in text:
+        if ch.isalpha():
+            break
+        k += 1
+    return k * (k - 1) // 2
+
+
 def get_the_residual_line(row):
     """Remove the last_name from the line and return the residual."""
     last_name = row["last_name"]
     residual_line = row["line_complete"]
     if isinstance(last_name, str) and last_name.strip() != "":
         residual_line = residual_line.replace(last_name, "", 1)
-        for i, ch in enumerate(residual_line):
-            if not ch.isalpha():
-                residual_line = residual_line[i:]
-            else:
-                break
-        residual_line = residual_line.strip()
+        residual_line = residual_line[_leading_cut(residual_line):].strip()
     row["residual_line"] = residual_line
     return row
 
@@ -75,12 +90,7 @@ def update_residual_after_initials(row):
     residual_line = row["residual_line"]
     if isinstance(initials, str) and initials.strip() != "":
         residual_line = residual_line.replace(initials, "", 1)
-        for i, ch in enumerate(residual_line):
-            if not ch.isalpha():
-                residual_line = residual_line[i:]
-            else:
-                break
-        residual_line = residual_line.strip()
+        residual_line = residual_line[_leading_cut(residual_line):].strip()
     row["residual_line"] = residual_line
     if initials == ".":
         row["initials"] = ""
@@ -95,12 +105,7 @@ def update_residual_after_second_last_name(row):
     residual_line = row["residual_line"]
     if isinstance(second_last_name, str) and second_last_name.strip() != "":
         residual_line = residual_line.replace(second_last_name, "", 1)
-        for i, ch in enumerate(residual_line):
-            if not ch.isalpha():
-                residual_line = residual_line[i:]
-            else:
-                break
-        residual_line = residual_line.strip()
+        residual_line = residual_line[_leading_cut(residual_line):].strip()
     row["residual_line"] = residual_line
     return row
 
@@ -121,42 +126,246 @@ def update_residual_after_occupation(row):
     if isinstance(occ_reg, str) and occ_reg.strip() != "" and occ_reg.lower() in residual_line.lower():
         index_fin = residual_line.lower().index(occ_reg.lower()) + len(occ_reg)
         residual_line = residual_line[index_fin:]
-        for i, ch in enumerate(residual_line):
-            if not ch.isalpha():
-                residual_line = residual_line[i:]
-            else:
-                break
-        residual_line = residual_line.strip()
+        residual_line = residual_line[_leading_cut(residual_line):].strip()
 
     row["residual_line"] = residual_line
     return row
 
 
+_F_D_RE = re.compile(r'\bf\.\s*d\.')
+
+
+def _span(offsets, start, end):
+    """``line_complete`` span of residual characters ``start:end``; -1 when
+    empty or when they are not one run of ``line_complete`` (text cut out
+    between them, e.g. an ``f. d.``)."""
+    if 0 <= start < end <= len(offsets) and offsets[end - 1] - offsets[start] == end - start - 1:
+        return offsets[start], offsets[end - 1] + 1
+    return -1, -1
+
+
+class ResidualLines:
+    """Column-wise residual of ``line_complete`` as fields are cut out of it.
+
+    Does the work of ``get_the_residual_line`` and the
+    ``update_residual_after_*`` row functions over whole columns.  Besides
+    the residual text, every row keeps the ``line_complete`` offset of each
+    residual character, so each removal also reports where the removed
+    field sits in the original line.
+
+    Extraction of the next field reads the residual left by the previous
+    removal, so the stages are called in pipeline order with ``text``
+    written back to ``residual_line`` in between.
+    """
+
+    def __init__(self, lines):
+        self.text = []
+        self.offsets = []
+        for line in lines:
+            self.text.append(line)
+            self.offsets.append(list(range(len(line))) if isinstance(line, str) else [])
+
+    def _trim(self, i, text, offsets):
+        cut = _leading_cut(text)
+        text = text[cut:]
+        left = len(text) - len(text.lstrip())
+        stripped = text.strip()
+        self.text[i] = stripped
+        self.offsets[i] = offsets[cut + left:cut + left + len(stripped)]
+
+    def remove_first(self, values):
+        """Cut the first occurrence of each value (last name, initials,
+        second last name) and trim; returns the ``(starts, ends)`` spans."""
+        starts, ends = [], []
+        for i, value in enumerate(values):
+            text, offsets = self.text[i], self.offsets[i]
+            if not (isinstance(value, str) and value.strip() != "" and isinstance(text, str)):
+                starts.append(-1)
+                ends.append(-1)
+                continue
+            pos = text.find(value)
+            if pos >= 0:
+                start, end = _span(offsets, pos, pos + len(value))
+                text = text[:pos] + text[pos + len(value):]
+                offsets = offsets[:pos] + offsets[pos + len(value):]
+            else:
+                start, end = -1, -1
+            starts.append(start)
+            ends.append(end)
+            self._trim(i, text, offsets)
+        return starts, ends
+
+    def remove_f_d(self):
+        """Drop every ``f. d.`` marker; returns the ``f_d_`` flags."""
+        flags = []
+        for i, text in enumerate(self.text):
+            matches = list(_F_D_RE.finditer(str(text)))
+            if not matches:
+                flags.append(0)
+                continue
+            flags.append(1)
+            text, offsets = str(text), self.offsets[i]
+            kept_text, kept_offsets, prev = [], [], 0
+            for m in matches:
+                kept_text.append(text[prev:m.start()])
+                kept_offsets.extend(offsets[prev:m.start()])
+                prev = m.end()
+            kept_text.append(text[prev:])
+            kept_offsets.extend(offsets[prev:])
+            text = "".join(kept_text)
+            if text and text[0] == ",":
+                text = text[1:]
+                kept_offsets = kept_offsets[1:]
+                left = len(text) - len(text.lstrip())
+                text = text.strip()
+                kept_offsets = kept_offsets[left:left + len(text)]
+            self.text[i] = text
+            self.offsets[i] = kept_offsets
+        return flags
+
+    def remove_occupation(self, occ_regs):
+        """Cut everything up to the end of the occupation (``occ_reg``, or a
+        lowercase first comma field when none was found); returns the
+        ``(starts, ends)`` spans of ``occ_reg`` (-1 when it is empty)."""
+        starts, ends = [], []
+        for i, occ_reg in enumerate(occ_regs):
+            text, offsets = self.text[i], self.offsets[i]
+            found_occ = occ_reg != ""
+            if found_occ:
+                occ_reg = occ_reg.strip()
+            else:
+                head = text.split(",")[0].strip()
+                if not head.islower():
+                    starts.append(-1)
+                    ends.append(-1)
+                    continue
+                occ_reg = head
+
+            left = len(text) - len(text.lstrip())
+            text = text.strip()
+            offsets = offsets[left:left + len(text)]
+            start, end = -1, -1
+            if isinstance(occ_reg, str) and occ_reg.strip() != "" and occ_reg.lower() in text.lower():
+                pos = text.lower().index(occ_reg.lower())
+                # Offsets into text.lower() only carry over to text when
+                # lowering kept the length (it does not for e.g. 'İ').
+                if found_occ and text[pos:pos + len(occ_reg)].lower() == occ_reg.lower():
+                    start, end = _span(offsets, pos, pos + len(occ_reg))
+                text = text[pos + len(occ_reg):]
+                offsets = offsets[pos + len(occ_reg):]
+                self._trim(i, text, offsets)
+            else:
+                self.text[i] = text
+                self.offsets[i] = offsets
+            starts.append(start)
+            ends.append(end)
+        return starts, ends
+
+
+def strip_dotted_initials(initials):
+    """Column form of the initials tidy-up in ``update_residual_after_initials``."""
+    return initials.map(lambda x: x.strip() if isinstance(x, str) and x[:1] == "." else x)
+
+
+# ── Field spans ─────────────────────────────────────────────────────────
+#
+# ``<field>_start`` / ``<field>_end`` give where a field's text sits in
+# ``line_complete``.  Later steps rewrite both the fields and the line
+# without touching the spans, so :func:`locate_fields` recomputes them once
+# the line is final and :func:`clear_stale_spans` resets any that no longer
+# point at their field before a frame is written out.
+
+SPAN_FIELDS = ("last_name", "initials", "occ_reg", "parish", "income")
+
+
+def locate_fields(df):
+    """Recompute the ``last_name``, ``initials`` and ``occ_reg`` spans over
+    the current ``line_complete``, cutting the fields as Step 4 does."""
+    residuals = ResidualLines(df["line_complete"].fillna(""))
+    df["last_name_start"], df["last_name_end"] = residuals.remove_first(df["last_name"])
+    df["initials_start"], df["initials_end"] = residuals.remove_first(df["initials"])
+    residuals.remove_first(df["second_last_name"])
+    residuals.remove_f_d()
+    df["occ_reg_start"], df["occ_reg_end"] = residuals.remove_occupation(df["occ_reg"])
+    return df
+
+
+def _span_text(value):
+    """*value* as the text it was cut from (CSV round trips turn incomes
+    into numbers), or None."""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if isinstance(value, (int, str)) and not isinstance(value, bool):
+        return str(value).strip()
+    return None
+
+
+def clear_stale_spans(df, fields=SPAN_FIELDS):
+    """Set to -1 every span whose text in ``line_complete`` is no longer
+    its field (compared without case for ``occ_reg``)."""
+    lines = df["line_complete"].to_numpy()
+    for field in fields:
+        if f"{field}_start" not in df.columns:
+            continue
+        starts = df[f"{field}_start"].to_numpy(dtype="int64")
+        ends = df[f"{field}_end"].to_numpy(dtype="int64")
+        fold = str.lower if field == "occ_reg" else str
+        keep = np.zeros(len(df), dtype=bool)
+        for i, (line, value, start, end) in enumerate(
+                zip(lines, df[field].to_numpy(), starts, ends)):
+            text = _span_text(value)
+            keep[i] = (bool(text) and isinstance(line, str) and 0 <= start < end
+                       and fold(line[start:end].strip()) == fold(text))
+        df[f"{field}_start"] = np.where(keep, starts, -1)
+        df[f"{field}_end"] = np.where(keep, ends, -1)
+    return df
+
+
 # ── Line splitting ──────────────────────────────────────────────────────
 
-def _only_firm_occup_pattern_hyphens(line, occ_list):
-    """Return True if every '-' in the line belongs to a firm/occ pattern."""
-    firm_pattern_list = (
-        [re.sub(r'\\', '', p) for p in FIRM_PATTERN.split('|')]
-        + ["fabrik", "sverk", "Bank", "bank ", "bank,", "Jarnvag ", "Jarnvag,", "jarnvag,", "jarnvag "]
-    )
-    firm_pattern_list = [w for w in firm_pattern_list if "-" in w]
-    occ_with_line = occ_list[occ_list["occ_llm"].str.contains("-")]
-    occ_with_line = occ_with_line.sort_values(by="occ_llm", key=lambda x: x.str.len(), ascending=False)
+class HyphenMatcher:
+    """Firm / occupation words that legitimately contain a hyphen.
+
+    Built once from the occupation list: the hyphenated firm words come
+    first, then the hyphenated occupations longest first, all in a single
+    :class:`~ocr_modules.utils.AhoCorasick` automaton whose lowest matching
+    id is the word the old in-order scan would stop at.
+    """
+
+    def __init__(self, occ_list):
+        firm_pattern_list = (
+            [re.sub(r'\\', '', p) for p in FIRM_PATTERN.split('|')]
+            + ["fabrik", "sverk", "Bank", "bank ", "bank,", "Jarnvag ", "Jarnvag,", "jarnvag,", "jarnvag "]
+        )
+        firm_pattern_list = [w for w in firm_pattern_list if "-" in w]
+        occ_with_line = occ_list[occ_list["occ_llm"].str.contains("-")]
+        occ_with_line = occ_with_line.sort_values(by="occ_llm", key=lambda x: x.str.len(), ascending=False)
+        self.words = firm_pattern_list + list(occ_with_line["occ_llm"])
+        self._automaton = AhoCorasick(self.words)
+
+    def first(self, line):
+        """The first listed word occurring in *line*, or None."""
+        pid = self._automaton.first(line)
+        return None if pid is None else self.words[pid]
+
+
+def build_hyphen_matcher(occ_list):
+    """Build the :class:`HyphenMatcher` once per run for :func:`split_line`."""
+    return HyphenMatcher(occ_list)
 
+
+def _only_firm_occup_pattern_hyphens(line, occ_list, hyphen_matcher=None):
+    """Return True if every '-' in the line belongs to a firm/occ pattern."""
     hyphen_positions = [m.start() for m in re.finditer(r'-', line)]
     if not hyphen_positions:
         return True
 
-    for word in firm_pattern_list:
-        if word in line:
-            control_ = line.replace(word, "")
-            return "-" not in control_
-
-    for word in occ_with_line["occ_llm"]:
-        if word in line:
-            control_ = line.replace(word, "")
-            return "-" not in control_
+    if hyphen_matcher is None:
+        hyphen_matcher = build_hyphen_matcher(occ_list)
+    word = hyphen_matcher.first(line)
+    if word is not None:
+        control_ = line.replace(word, "")
+        return "-" not in control_
 
     if re.search(r'\b[a-zA-Z]+(\s*-\s*)[a-zA-Z]+\b', line):
         return True
@@ -164,8 +373,10 @@ def _only_firm_occup_pattern_hyphens(line, occ_list):
     return False  # fallback
 
 
-def split_line(df, occ_list):
+def split_line(df, occ_list, hyphen_matcher=None):
     """Assign split codes (0=solo, 1=first-half, 2=second-half, 3=complete)."""
+    if hyphen_matcher is None:
+        hyphen_matcher = build_hyphen_matcher(occ_list)
     df = df.copy()
     df["split"] = 0
 
@@ -214,10 +425,10 @@ def split_line(df, occ_list):
         # ---------- Condition 1-bis ----------
         if (line and re.search(r'[A-Z]', line) and re.search(r'[a-z]', line)
                 and re.search(r'\d+', line) and len(re.findall(r'\d', line)) > 1
-                and (df.at[idx, "initials"] != "" or re.search(FIRM_PATTERN, line))
+                and (df.at[idx, "initials"] != "" or FIRM_MATCHER.has_match(line))
                 and not line[0].isdigit()
                 and (line.endswith('-') or line[-1].isalpha() or line.endswith(',')
-                     or ((df.at[idx, "initials"] != "" or re.search(FIRM_PATTERN, line))
+                     or ((df.at[idx, "initials"] != "" or FIRM_MATCHER.has_match(line))
                          and line[-1].isdigit()))):
             if pos + 1 < len(idx_list):
                 nxt = idx_list[pos + 1]
@@ -250,7 +461,7 @@ def split_line(df, occ_list):
                                             or (next_line[0].isupper() and next_line[1] in [".", ","])
                                             or (next_line[0].isupper() and next_line[2] in [".", ","])))
                           and any(num > 1000 for num in [int(x) for x in re.findall(r'\d+', next_line)]))
-                         or (re.search(FIRM_PATTERN, line)
+                         or (FIRM_MATCHER.has_match(line)
                              and any(num > 1000 for num in [int(x) for x in re.findall(r'\d+', next_line)])
                              and (not next_line or (not next_line[0].isupper()
                                                     or (next_line[0].isupper() and not next_line.startswith("A.-B") and next_line[1] in [".", ","])
@@ -262,12 +473,12 @@ def split_line(df, occ_list):
         # ---------- Condition 2-bis ----------
         if (line
                 and (re.search(r'[A-Za-z]', line.split(",")[0]) or re.search(r'[A-Za-z]', line.split()[0]))
-                and _only_firm_occup_pattern_hyphens(line, occ_list)
+                and _only_firm_occup_pattern_hyphens(line, occ_list, hyphen_matcher)
                 and len(line) > 10
                 and not re.search(r'\d+(?:\s+|-)\d+', line)
                 and not re.search(r'\d+\s*inv\.\)', line)
                 and ((re.search(r'[a-z]', line) and re.search(r'[A-Z]', line) and line[0].isupper())
-                     or re.search(FIRM_PATTERN, line))):
+                     or FIRM_MATCHER.has_match(line))):
             if pos + 1 < len(idx_list):
                 nxt = idx_list[pos + 1]
                 next_line = str(df.at[nxt, "line"]) if pd.notna(df.at[nxt, "line"]) else ""
@@ -280,7 +491,7 @@ def split_line(df, occ_list):
                         combined = line + next_line
                         if ((re.search(r'-\s*\d+', combined) and not next_line[0].isupper())
                                 or ((re.search(r'\s*\d+-', combined) or re.search(r'^-\s*\d+\s+\d+$', next_line))
-                                    and re.search(FIRM_PATTERN, line)
+                                    and FIRM_MATCHER.has_match(line)
                                     and (not next_line[0].isupper()
                                          or (next_line[0].isupper() and not next_line.startswith("A.-B") and next_line[1] in [".", ","])
                                          or (next_line[0].isupper() and next_line[2] in [".", ","])))):
@@ -293,7 +504,7 @@ def split_line(df, occ_list):
                 and not re.search(r'\d+\s*inv\.\)', line)
                 and ((line[0].isupper() and re.search(r'[a-z]', line) and re.search(r'[A-Z]', line)
                       and "," in line and df.at[idx, "initials"] != "")
-                     or re.search(FIRM_PATTERN, line))):
+                     or FIRM_MATCHER.has_match(line))):
             if pos + 1 < len(idx_list):
                 nxt = idx_list[pos + 1]
                 next_line = str(df.at[nxt, "line"]) if pd.notna(df.at[nxt, "line"]) else ""
@@ -311,6 +522,57 @@ def split_line(df, occ_list):
     return df
 
 
+# ── Parallel line splitting ─────────────────────────────────────────────
+
+_SPLIT_STATE = {}
+
+
+def _init_split_worker(occ_list, hyphen_matcher):
+    """Pool initializer: keep the occupation list and hyphen table for every group."""
+    _SPLIT_STATE["occ_list"] = occ_list
+    _SPLIT_STATE["hyphen_matcher"] = hyphen_matcher
+
+
+def _worker_split_line(task):
+    """Run :func:`split_line` on one ``(key, group)`` task (child process)."""
+    key, group = task
+    return key, split_line(group, _SPLIT_STATE["occ_list"], _SPLIT_STATE["hyphen_matcher"])
+
+
+def parallel_split_line(surname_list, occ_list, n_workers=None):
+    """``surname_list.groupby(["page", "column"]).apply(split_line)`` on a
+    process pool.
+
+    ``split_line`` only looks at rows within one page column, so the groups
+    are independent.  They are split in worker processes (the occupation
+    list and hyphen table are sent to each worker once) and the results are put back through
+    the same ``groupby.apply``, so the output frame, its index and group
+    order are those of the serial call.
+
+    Parameters
+    ----------
+    n_workers : int, optional
+        Number of worker processes.  Defaults to ``os.cpu_count()``; with one
+        worker (or one group) the serial ``groupby.apply`` is used.
+    """
+    grouped = surname_list.groupby(["page", "column"])
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    n_workers = max(1, min(n_workers, grouped.ngroups))
+    hyphen_matcher = build_hyphen_matcher(occ_list)
+    if n_workers <= 1:
+        return grouped.apply(lambda g: split_line(g, occ_list, hyphen_matcher))
+
+    results = {}
+    chunksize = max(1, grouped.ngroups // (n_workers * 4))
+    with mp.Pool(processes=n_workers, initializer=_init_split_worker,
+                 initargs=(occ_list, hyphen_matcher)) as pool:
+        for key, result in pool.imap_unordered(_worker_split_line, grouped,
+                                               chunksize=chunksize):
+            results[key] = result
+    return grouped.apply(lambda g: results[g.name])
+
+
 # ── Third-line adjustment ───────────────────────────────────────────────
 
 def third_line(df, occ_list):
@@ -335,8 +597,8 @@ def third_line(df, occ_list):
                             and df.at[idx_next, "split"] == 0
                             and len(re.findall(r'\d+', combined_)) <= 3
                             and not any(word in df.at[idx, "line"] for word in occ__)
-                            and (re.search(FIRM_PATTERN, prev_line) or df.at[idx_prev, "initials"] != "")
-                            and not any(w in re.findall(FIRM_PATTERN, line) for w in re.findall(FIRM_PATTERN, prev_line))):
+                            and (FIRM_MATCHER.has_match(prev_line) or df.at[idx_prev, "initials"] != "")
+                            and not any(w in FIRM_MATCHER.findall(line) for w in FIRM_MATCHER.findall(prev_line))):
                         df.at[idx_next, "split"] = 4
                         df.at[idx_prev, "line_complete"] = prev_compl_line + " " + next_line
     return df
@@ -373,7 +635,7 @@ def adj_sec_lowercase_LN(df):
             else:
                 df.at[idx, "split"] = 3
             if (len(prv_line.split(",")) > 2
-                    and (re.search(FIRM_PATTERN, prv_line) or re.search(INITIALS_PATTERN, prv_line))
+                    and (FIRM_MATCHER.has_match(prv_line) or re.search(INITIALS_PATTERN, prv_line))
                     and any(x > 1000 for x in [int(n) for n in re.findall(r'\d+', next_line)])):
                 df.at[prv, "split"] = 3
     return df
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+match_cache.py – Persistent cache of last-name matching results.
+
+The A1–A5 cascade in :mod:`last_name_matching` is a pure function of the
+line text and the reference data (death register + dirty-name list), and
+the same lines recur across OCR providers and re-runs.  Results are stored
+in a small SQLite file keyed by the line and a fingerprint of the
+reference data; entries written against other reference data are dropped
+when the cache is opened, so a changed register invalidates it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+from typing import Dict, Iterable, Tuple
+
+import pandas as pd
+
+# Bump when the matching cascade changes in a way that alters its output.
+CACHE_VERSION = 1
+
+RESULT_COLUMNS = ["matched", "index", "best_match", "similarity", "last_name"]
+
+
+def reference_fingerprint(df_death_reg_unacc: pd.DataFrame,
+                          dirty_last_names_list: pd.DataFrame) -> str:
+    """Hash of everything besides the line that the match result depends on."""
+    h = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+    # Register order matters: ties go to the first candidate in scan order.
+    for name in df_death_reg_unacc["last_name"].dropna():
+        h.update(b"\x00" + str(name).encode("utf-8"))
+    h.update(b"\x01")
+    for dirty, clean in dirty_last_names_list[["last_name", "last_name_clean"]].itertuples(
+            index=False, name=None):
+        h.update(b"\x00" + str(dirty).encode("utf-8")
+                 + b"\x02" + str(clean).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _to_db(value):
+    """Missing fields (e.g. no ``best_match`` on A1 rows) are stored as NULL."""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return None
+    if hasattr(value, "item"):  # numpy scalar
+        return value.item()
+    return value
+
+
+class MatchCache:
+    """SQLite-backed ``line → match result`` cache for one set of references.
+
+    Parameters
+    ----------
+    path : str
+        SQLite file; created if missing.
+    fingerprint : str
+        Reference-data fingerprint, see :func:`reference_fingerprint`.
+    """
+
+    def __init__(self, path: str, fingerprint: str):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS matches ("
+            " fingerprint TEXT NOT NULL,"
+            " line TEXT NOT NULL,"
+            " matched INTEGER,"
+            " idx TEXT,"
+            " best_match TEXT,"
+            " similarity REAL,"
+            " last_name TEXT,"
+            " PRIMARY KEY (fingerprint, line))"
+        )
+        self._conn.execute("DELETE FROM matches WHERE fingerprint != ?", (fingerprint,))
+        self._conn.commit()
+
+    @classmethod
+    def for_references(cls, path: str, df_death_reg_unacc: pd.DataFrame,
+                       dirty_last_names_list: pd.DataFrame) -> "MatchCache":
+        """Open the cache at *path* for the given reference data."""
+        return cls(path, reference_fingerprint(df_death_reg_unacc, dirty_last_names_list))
+
+    def lookup(self, lines: Iterable[str]) -> Dict[str, Tuple]:
+        """Cached results for *lines*, as ``line → (matched, index, best_match,
+        similarity, last_name)``; lines not in the cache are left out."""
+        lines = list(dict.fromkeys(lines))
+        found: Dict[str, Tuple] = {}
+        step = 500  # stay below SQLite's bound-parameter limit
+        for start in range(0, len(lines), step):
+            part = lines[start:start + step]
+            query = (
+                "SELECT line, matched, idx, best_match, similarity, last_name"
+                " FROM matches WHERE fingerprint = ? AND line IN ("
+                + ",".join("?" * len(part)) + ")"
+            )
+            for line, *fields in self._conn.execute(query, [self.fingerprint, *part]):
+                found[line] = tuple(fields)
+        self.hits += len(found)
+        self.misses += len(lines) - len(found)
+        return found
+
+    def store(self, results: pd.DataFrame) -> None:
+        """Save the match result columns of *results*, keyed by ``line``."""
+        frame = results.reindex(columns=["line"] + RESULT_COLUMNS)
+        rows = [
+            (self.fingerprint, line, _to_db(matched), _to_db(idx),
+             _to_db(best_match), _to_db(similarity), _to_db(last_name))
+            for line, matched, idx, best_match, similarity, last_name
+            in frame.drop_duplicates(subset="line").itertuples(index=False, name=None)
+        ]
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO matches VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -5,28 +5,99 @@ occupation.py – Occupation extraction, fuzzy matching, and adjustments.
 
 import re
 import string
+from dataclasses import dataclass
+from typing import FrozenSet
+
 import pandas as pd
 from rapidfuzz import fuzz
 
-from .utils import fuzzy_match_rapidfuzz
+from .utils import fuzzy_match_rapidfuzz, fuzzy_match_rapidfuzz_batch
+
+
+# ── Occupation vocabulary ───────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class OccupationVocabulary:
+    """Hashed views of ``occ_list["occ_llm"]`` for membership tests.
+
+    ``words`` holds the occupations as listed, ``normalized`` their
+    ``str(word).lower().strip()`` forms.
+    """
+    words: FrozenSet[str]
+    normalized: FrozenSet[str]
+
+
+def build_occupation_vocabulary(occ_list):
+    """Build the :class:`OccupationVocabulary` of ``occ_list``."""
+    values = occ_list["occ_llm"].values
+    return OccupationVocabulary(
+        words=frozenset(w for w in values if isinstance(w, str)),
+        normalized=frozenset(str(w).lower().strip() for w in values),
+    )
 
 
 # ── Exact occupation extraction ─────────────────────────────────────────
 
-def extract_occ(row, occ_list):
-    """Try to find an exact occupation match in the residual line."""
+_PUNCT_TABLE = str.maketrans('', '', string.punctuation)
+
+
+def _clean_token(s):
+    return s.strip().lower().translate(_PUNCT_TABLE)
+
+
+class OccupationIndex:
+    """Occupation list keyed by cleaned token, for :func:`extract_occ`.
+
+    ``by_token`` maps the cleaned form of each occupation (lowercase, no
+    punctuation) to its ``(rank, word)`` entries, rank being the position in
+    the longest-first occupation list.
+    """
+
+    def __init__(self, words):
+        self.by_token = {}
+        for rank, word in enumerate(words):
+            if isinstance(word, str):
+                self.by_token.setdefault(_clean_token(word), []).append(
+                    (rank, word, word.lower().rstrip()))
+
+    def first_match(self, line):
+        """Highest-priority occupation in the normalized *line*, or ``None``.
+
+        A word matches when it occurs in the line and its cleaned form equals
+        a cleaned whitespace token or comma segment of the line.
+        """
+        keys = {_clean_token(t) for t in line.split()}
+        keys.update(_clean_token(t) for t in line.split(","))
+        best = None
+        for key in keys:
+            for rank, word, needle in self.by_token.get(key, ()):
+                if best is not None and rank >= best[0]:
+                    break
+                if needle in line:
+                    best = (rank, word)
+                    break
+        return None if best is None else best[1]
+
+
+def build_occupation_index(occ_list):
+    """Build an :class:`OccupationIndex` from ``occ_list`` (list order)."""
+    return OccupationIndex(occ_list["occ_llm"].values)
+
+
+def extract_occ(row, occ_list, occ_index=None):
+    """Try to find an exact occupation match in the residual line.
+
+    Pass a prebuilt *occ_index* (see :func:`build_occupation_index`) to
+    avoid rebuilding it from ``occ_list`` on every call.
+    """
     line = row["residual_line"]
     if isinstance(line, str):
+        if occ_index is None:
+            occ_index = build_occupation_index(occ_list)
         line = re.sub(r'\s+', ' ', line.strip().lower())
-        for word in occ_list["occ_llm"]:
-            def clean_token(s):
-                return s.strip().lower().translate(str.maketrans('', '', string.punctuation))
-            if isinstance(word, str) and word.lower().rstrip() in line:
-                if isinstance(word, str) and (
-                        any(clean_token(word) == clean_token(lw) for lw in line.split()) or
-                        any(clean_token(word) == clean_token(lw) for lw in line.split(","))):
-                    row["occ_reg"] = word
-                    break
+        word = occ_index.first_match(line)
+        if word is not None:
+            row["occ_reg"] = word
     row["occ_reg"] = "" if len(row["occ_reg"]) < 3 or row["occ_reg"] == "hustru" else row["occ_reg"].strip()
     row["occ_reg"] = row["occ_reg"].lower()
     return row
@@ -34,8 +105,8 @@ def extract_occ(row, occ_list):
 
 # ── Fuzzy occupation matching ───────────────────────────────────────────
 
-def occ_fuzz(row, occ_list):
-    """Fuzzy-match lowercase words in the line against the occupation list."""
+def _occ_fuzz_candidate(row):
+    """Lowercase phrase of the line that :func:`occ_fuzz` scores, or ``None``."""
     line = str(row["line_complete"])
     if (row["split"] in [1, 3]
             and row["firm_dummy"] == 0
@@ -46,19 +117,54 @@ def occ_fuzz(row, occ_list):
         lower_cases_ = " ".join([w for w in line.split() if w and w[0].islower()])
         lower_cases_ = lower_cases_.replace(",", " ").strip()
         if not lower_cases_:
-            return ""
+            return None
         parts = [p.strip() for p in lower_cases_.split(",") if p.strip()]
         candidate = parts[1] if len(parts) > 1 else parts[0]
-        candidate = candidate.strip()
-        best_match, score, _idx = fuzzy_match_rapidfuzz(candidate, occ_list["occ_llm"])
-        return best_match if score >= 85.5 else ""
-    return ""
+        return candidate.strip()
+    return None
+
+
+def _match_occ(candidate, occ_list, occ_matcher):
+    if occ_matcher is not None:
+        return occ_matcher.match(candidate)
+    return fuzzy_match_rapidfuzz(candidate, occ_list["occ_llm"])
+
+
+def occ_fuzz(row, occ_list, occ_matcher=None):
+    """Fuzzy-match lowercase words in the line against the occupation list.
+
+    *occ_matcher* is an optional :class:`utils.FuzzyMatcher` over
+    ``occ_list["occ_llm"]``, shared across rows.
+    """
+    candidate = _occ_fuzz_candidate(row)
+    if candidate is None:
+        return ""
+    best_match, score, _idx = _match_occ(candidate, occ_list, occ_matcher)
+    return best_match if score >= 85.5 else ""
+
+
+def batch_occ_fuzz(df, occ_list, workers=-1):
+    """Column-level :func:`occ_fuzz`; returns a Series aligned with *df*.
+
+    Candidates of all rows are scored together, each distinct one once
+    (see :func:`utils.fuzzy_match_rapidfuzz_batch`).
+    """
+    candidates = [_occ_fuzz_candidate(row) for row in df.to_dict("records")]
+    matches = fuzzy_match_rapidfuzz_batch(
+        candidates, occ_list["occ_llm"], score_cutoff=85.5, workers=workers)
+    return pd.Series(
+        [matches[c][0] if c in matches else "" for c in candidates],
+        index=df.index, dtype=object)
 
 
 # ── Secondary occupation extraction ─────────────────────────────────────
 
-def sec_occup(row, occ_list):
-    """Extract a second occupation from the line (if any)."""
+def _sec_occup_candidate(row):
+    """Phrase of the line that :func:`sec_occup` scores.
+
+    Returns ``None`` for rows :func:`sec_occup` skips and ``""`` when the
+    line has no usable phrase; both are also its final result.
+    """
     line = str(row["line_complete"])
     ln = str(row["last_name"])
     occ_ = str(row["occ_reg"])
@@ -71,24 +177,52 @@ def sec_occup(row, occ_list):
             return ""
         parts = [p.strip() for p in line_split if p.strip()]
         candidate = parts[1] if len(parts) > 1 and line.startswith(parts[0]) else parts[0]
-        candidate = candidate.strip()
-        best_match, score, _idx = fuzzy_match_rapidfuzz(candidate, occ_list["occ_llm"])
-        return (candidate if score >= 87 and occ_ not in candidate
-                and candidate not in occ_ and not line.startswith(candidate)
-                and candidate.lower() != occ_.lower() else "")
+        return candidate.strip()
     return None
 
 
+def _sec_occup_result(row, candidate, score):
+    line = str(row["line_complete"])
+    occ_ = str(row["occ_reg"])
+    return (candidate if score >= 87 and occ_ not in candidate
+            and candidate not in occ_ and not line.startswith(candidate)
+            and candidate.lower() != occ_.lower() else "")
+
+
+def sec_occup(row, occ_list, occ_matcher=None):
+    """Extract a second occupation from the line (if any)."""
+    candidate = _sec_occup_candidate(row)
+    if not candidate:
+        return candidate
+    best_match, score, _idx = _match_occ(candidate, occ_list, occ_matcher)
+    return _sec_occup_result(row, candidate, score)
+
+
+def batch_sec_occup(df, occ_list, workers=-1):
+    """Column-level :func:`sec_occup`; returns a Series aligned with *df*."""
+    rows = df.to_dict("records")
+    candidates = [_sec_occup_candidate(row) for row in rows]
+    matches = fuzzy_match_rapidfuzz_batch(
+        [c for c in candidates if c], occ_list["occ_llm"],
+        score_cutoff=87, workers=workers)
+    return pd.Series(
+        [c if not c else _sec_occup_result(row, c, matches[c][1] if c in matches else 0)
+         for row, c in zip(rows, candidates)],
+        index=df.index, dtype=object)
+
+
 # ── Suspect-occupation adjustment ───────────────────────────────────────
 
-def adj_suspect_occ(row, occ_list):
+def adj_suspect_occ(row, occ_list, occ_vocab=None):
     """Re-scan for occupations on rows that have none yet."""
+    if occ_vocab is None:
+        occ_vocab = build_occupation_vocabulary(occ_list)
     line = row["line_complete"]
     if (row["occ_reg"] == "" and row["firm_dummy"] == 0
             and row["split"] in [1, 3] and row["index"] != "A1"
             and not re.search(r'froken|ankefru|\bfru', line)):
         line_split = [x.strip() for x in line.split(",")]
         for word in line_split:
-            if any(word == occ_ for occ_ in occ_list["occ_llm"].values):
+            if word in occ_vocab.words:
                 row["occ_reg"] = word
     return row
@@ -18,8 +18,85 @@ import re
 import pandas as pd
 from rapidfuzz import process, fuzz
 
-from .config import FIRM_PATTERN, INITIALS_PATTERN, PARISH_DICT_KNOWN
-from .utils import fuzzy_match_rapidfuzz
+from .config import FIRM_MATCHER, INITIALS_PATTERN, PARISH_DICT_KNOWN
+from .utils import FuzzyMatcher, map_unique
+from .occupation import build_occupation_vocabulary
+
+
+# ── Candidate spans ─────────────────────────────────────────────────────
+#
+# The extractors pick the parish from a normalised copy of line_complete.
+# These helpers line the normalised tokens up with the text they came
+# from, so ``parish_start`` / ``parish_end`` point at the token the split
+# actually chose rather than at the first occurrence of the same text.
+# A span is only kept when that text is the parish verbatim.
+
+_DIGIT_SUFFIX_RE = re.compile(r'(\d+)[A-Za-z]+')
+
+
+def _word_spans(line, words):
+    """Span in *line* of each of ``extract_parish``'s space-split *words*,
+    or None if they do not line up."""
+    spans = []
+    for m in re.finditer(r'[^\s,]+', line):
+        if _DIGIT_SUFFIX_RE.sub(r'\1', m.group().replace("-", "")):
+            spans.append((m.start(), m.end()))
+    return spans if len(spans) == len(words) else None
+
+
+def _field_spans(line):
+    """Span of each comma-separated field of *line*."""
+    spans, start = [], 0
+    for m in re.finditer(",", line):
+        spans.append((start, m.start()))
+        start = m.end()
+    spans.append((start, len(line)))
+    return spans
+
+
+def _part_spans(line, span):
+    """Spans of the whitespace / '-' separated parts of field *span*."""
+    start, end = span
+    return [(start + m.start(), start + m.end())
+            for m in re.finditer(r'[^\s-]+', line[start:end])]
+
+
+def _strip_span(line, span):
+    """*span* without surrounding whitespace."""
+    start, end = span
+    text = line[start:end]
+    return start + len(text) - len(text.lstrip()), end - len(text) + len(text.rstrip())
+
+
+def _parish_span(line, spans, k, parish):
+    """Span ``k`` of *spans* if *line* holds *parish* there, else ``(-1, -1)``."""
+    if spans is None:
+        return -1, -1
+    start, end = _strip_span(line, spans[k])
+    return (start, end) if line[start:end] == parish else (-1, -1)
+
+
+def _split_fields(line, line_sec, split_token):
+    """The comma split of ``extract_parish_no_init`` /
+    ``extra_parish_residual_cases`` with the span of each element (None if
+    they do not line up); fields for which *split_token* holds are split
+    further on whitespace and '-'."""
+    line_split = line_sec.split(",")
+    fields = _field_spans(line)
+    spans = fields if len(fields) == len(line_split) else None
+    for h, token in enumerate(line_split):
+        if split_token(token):
+            token_clean = token.replace("-", " ")
+            parts = token_clean.split()
+            if len(parts) > 1:
+                line_split = line_split[:h] + parts + line_split[h + 1:]
+                if spans is not None:
+                    part_spans = _part_spans(line, fields[h])
+                    spans = (spans[:h] + part_spans + spans[h + 1:]
+                             if len(part_spans) == len(parts) else None)
+    if spans is not None and len(spans) != len(line_split):
+        spans = None
+    return line_split, spans
 
 
 # ── 1. Extract parish (initials-based) ──────────────────────────────────
@@ -51,6 +128,7 @@ def extract_parish(row):
             break
         else:
             j += 1
+    spans = _word_spans(line, line_no_comma_split)
 
     if candidate and (
             (re.search(INITIALS_PATTERN, candidate) or re.search(parish_pattern, candidate)
@@ -60,6 +138,7 @@ def extract_parish(row):
         if pos_cand == -1:
             return row
         row["parish"] = candidate
+        row["parish_start"], row["parish_end"] = _parish_span(line, spans, pos_inc - j, candidate)
 
         def comma_betw_init(s, line_2=line):
             tokens = s.split()
@@ -89,13 +168,7 @@ def extract_parish_no_init(row):
     line = row["line_complete"]
     line_sec = re.sub(r'\s+', ' ', line).strip()
     line_sec = re.sub(r'(\d+)[A-Za-z]+', r'\1', line_sec)
-    line_split = line_sec.split(",")
-    for h, token in enumerate(line_split):
-        if re.search(r'\d+', token):
-            token_clean = token.replace("-", " ")
-            parts = token_clean.split()
-            if len(parts) > 1:
-                line_split = line_split[:h] + parts + line_split[h + 1:]
+    line_split, spans = _split_fields(line, line_sec, lambda token: re.search(r'\d+', token))
 
     inter_ = [x for x in line_split if not re.search(r'[A-Za-z]', x) and re.search(r'\d', x)]
     if not inter_:
@@ -127,6 +200,8 @@ def extract_parish_no_init(row):
             return row
         if candidate != row["occ_reg"]:
             row["parish"] = candidate
+            row["parish_start"], row["parish_end"] = _parish_span(
+                line, spans, pos_inc - j, candidate)
     return row
 
 
@@ -136,13 +211,8 @@ def extra_parish_residual_cases(row):
     line = row["line_complete"]
     line_sec = re.sub(r'\s+', ' ', line).strip()
     line_sec = re.sub(r'(\d+)[A-Za-z]+', r'\1', line_sec)
-    line_split = line_sec.split(",")
-    for h, token in enumerate(line_split):
-        if re.search(r'\d+\s*-\s*\d+', token):
-            token_clean = token.replace("-", " ")
-            parts = token_clean.split()
-            if len(parts) > 1:
-                line_split = line_split[:h] + parts + line_split[h + 1:]
+    line_split, spans = _split_fields(
+        line, line_sec, lambda token: re.search(r'\d+\s*-\s*\d+', token))
 
     inter_ = [x for x in line_split if not re.search(r'[A-Za-z]', x) and re.search(r'\d', x)]
     if not inter_:
@@ -176,44 +246,132 @@ def extra_parish_residual_cases(row):
             return row
         if candidate != row["occ_reg"]:
             row["parish"] = candidate
+            row["parish_start"], row["parish_end"] = _parish_span(
+                line, spans, pos_inc - j, candidate)
     return row
 
 
 # ── 4. Clean parish via abbreviation dictionary ─────────────────────────
 
-def cleaned_parish(row, dict_=None):
+_LETTERS_RE = re.compile(r"[A-Za-z]")
+
+
+def _letters(s):
+    """ASCII-letter signature of *s*: its letters with everything else dropped."""
+    return "".join(_LETTERS_RE.findall(s))
+
+
+class LetterSignatureIndex:
+    """Reference strings grouped by letter signature (see :func:`_letters`).
+
+    Each signature keeps its strings in input order, so :meth:`first`
+    returns what a scan of the reference in order would stop at.
+    Non-string entries are indexed by the signature of ``str(entry)`` but
+    never pass a length test.
+    """
+
+    def __init__(self, strings):
+        self._by_signature = {}
+        for key in strings:
+            self._by_signature.setdefault(_letters(str(key)), []).append(key)
+
+    def __contains__(self, signature):
+        return signature in self._by_signature
+
+    def first(self, text, max_len_diff):
+        """First string with *text*'s signature whose length is within
+        *max_len_diff* of ``len(text)``, or None."""
+        for key in self._by_signature.get(_letters(text), ()):
+            if isinstance(key, str) and abs(len(key) - len(text)) <= max_len_diff:
+                return key
+        return None
+
+    def near(self, text, max_len_diff):
+        """Whether :meth:`first` finds a string for *text*."""
+        return self.first(text, max_len_diff) is not None
+
+
+_KNOWN_PARISH_INDEX = LetterSignatureIndex(PARISH_DICT_KNOWN)
+# (dict, len(dict), index) of the last custom dict seen by cleaned_parish.
+_last_signature_index = [None, -1, None]
+
+
+def _signature_index(dict_):
+    """:class:`LetterSignatureIndex` of *dict_*'s keys, built once per dict
+    rather than once per row; rebuilt when its size changes."""
+    if dict_ is PARISH_DICT_KNOWN:
+        return _KNOWN_PARISH_INDEX
+    if _last_signature_index[0] is not dict_ or _last_signature_index[1] != len(dict_):
+        _last_signature_index[:] = [dict_, len(dict_), LetterSignatureIndex(dict_)]
+    return _last_signature_index[2]
+
+
+def cleaned_parish(row, dict_=None, signature_index=None):
+    """Map ``parish`` to ``parish_cleaned_`` through *dict_* (default
+    ``PARISH_DICT_KNOWN``), exactly or by letter signature.
+
+    *signature_index* must be built from *dict_*; when omitted, the index is
+    built once per dict and reused across rows.  Pass one explicitly if
+    *dict_* is edited in place without changing its size.
+    """
     if dict_ is None:
         dict_ = PARISH_DICT_KNOWN
+    if signature_index is None:
+        signature_index = _signature_index(dict_)
     parish = str(row["parish"])
     if parish in dict_:
         row["parish_cleaned_"] = dict_[parish]
         return row
-    parish_letters = "".join(re.findall(r"[A-Za-z]", parish))
-    for key, value in dict_.items():
-        key_letters = "".join(re.findall(r"[A-Za-z]", key))
-        if abs(len(key) - len(parish)) <= 1 and parish_letters == key_letters:
-            row["parish_cleaned_"] = value
-            return row
+    key = signature_index.first(parish, 1)
+    if key is not None:
+        row["parish_cleaned_"] = dict_[key]
     return row
 
 
 # ── 5. Map parish against reference table ───────────────────────────────
 
-def parish_map(row, proper_parish):
+def build_parish_reference(proper_parish):
+    """``parish → (mapped_parish, parish_cleaned)`` from the ``proper_parish``
+    table, built once per run; the first row wins for a repeated parish, as
+    with the ``.values[0]`` lookups it replaces."""
+    parish_ref = {}
+    for par, mapped, cleaned in proper_parish[["parish", "mapped_parish", "parish_cleaned"]].itertuples(
+            index=False, name=None):
+        parish_ref.setdefault(par, (mapped, cleaned))
+    return parish_ref
+
+
+def parish_map(row, proper_parish, parish_ref=None):
+    if parish_ref is None:
+        parish_ref = build_parish_reference(proper_parish)
     parish = row["parish"]
     if row["parish_cleaned_"] != "":
         return row
-    row_ = proper_parish.loc[proper_parish["parish"] == parish]
-    if not row_.empty:
-        mapped = row_["mapped_parish"].values[0]
-        cleaned = row_["parish_cleaned"].values[0]
+    ref = parish_ref.get(parish)
+    if ref is not None:
+        mapped, cleaned = ref
         row["parish_cleaned_"] = mapped if mapped != "" else cleaned
     return row
 
 
+def map_proper_parish(parishes, parish_ref):
+    """Column form of the ``proper_parish`` merge in Step 11: the mapped
+    parish, else the cleaned one, else the parish itself."""
+    def lookup(par):
+        mapped, cleaned = parish_ref.get(par, ("", ""))
+        if pd.notna(mapped) and mapped != "":
+            return mapped
+        if pd.notna(cleaned) and cleaned != "":
+            return cleaned
+        return par
+    return parishes.map(lookup)
+
+
 # ── 6. Parish adjustment (fill missing) ────────────────────────────────
 
-def parish_adjustment(row, proper_parish, comma=True):
+def parish_adjustment(row, proper_parish, comma=True, parish_ref=None):
+    if parish_ref is None:
+        parish_ref = build_parish_reference(proper_parish)
     line = row["line_complete"]
     if (row["parish"] == "" and row["split"] in [1, 3]
             and row["initials"] != "" and row["index"] != "A1"):
@@ -226,12 +384,11 @@ def parish_adjustment(row, proper_parish, comma=True):
             candidate = line_split[idx - 1].strip()
             if candidate == "" and idx - 1 > 0:
                 candidate = line_split[idx - 2].strip()
-            if candidate in proper_parish["parish"].values or re.search(r'[A-Z]', candidate):
+            if candidate in parish_ref or re.search(r'[A-Z]', candidate):
                 row["parish"] = candidate
-                row_ = proper_parish.loc[proper_parish["parish"] == candidate]
-                if not row_.empty:
-                    mapped = row_["mapped_parish"].values[0]
-                    cleaned = row_["parish_cleaned"].values[0]
+                ref = parish_ref.get(candidate)
+                if ref is not None:
+                    mapped, cleaned = ref
                     row["parish_cleaned_"] = mapped if mapped != "" else cleaned
     return row
 
@@ -251,23 +408,25 @@ def firms_parishes_(row, initials=True, comma=True):
         candidate = line_split[pos - 1] if pos > 0 else ""
         candidate = candidate.strip()
         if initials:
-            if (re.search(INITIALS_PATTERN, candidate) and not re.search(FIRM_PATTERN, candidate)) \
+            if (re.search(INITIALS_PATTERN, candidate) and not FIRM_MATCHER.has_match(candidate)) \
                     or re.fullmatch(r'[A-Za-z]{1,2}', candidate):
                 row["parish"] = candidate
         else:
             if (re.search(r'[A-Z]', candidate) and re.search(r'[a-z]', candidate)
-                    and not re.search(FIRM_PATTERN, candidate) and len(candidate) <= 25):
+                    and not FIRM_MATCHER.has_match(candidate) and len(candidate) <= 25):
                 row["parish"] = candidate
     return row
 
 
 # ── 8. Spot wrong occupation / parish collision ─────────────────────────
 
-def spot_wrong_occ(row, occ_list):
+def spot_wrong_occ(row, occ_list, occ_vocab=None):
     occ_reg = str(row["occ_reg"]).strip()
     parish = str(row["parish"]).strip()
     if parish and occ_reg and parish == occ_reg:
-        if not any(occ_reg.lower() == str(word).lower().strip() for word in occ_list["occ_llm"]):
+        if occ_vocab is None:
+            occ_vocab = build_occupation_vocabulary(occ_list)
+        if occ_reg.lower() not in occ_vocab.normalized:
             row["change_occ"] = 1
             row["occ_reg"] = ""
         else:
@@ -285,7 +444,7 @@ def remove_firms_from_parish(row, parish_num, parish_firm):
             or len(parish) > 30):
         row["parish"] = ""
         candidate = parish.split()[-1]
-        if any(w == candidate for w in parish_num[0].values) and not re.search(FIRM_PATTERN, candidate):
+        if any(w == candidate for w in parish_num[0].values) and not FIRM_MATCHER.has_match(candidate):
             row["parish"] = candidate
             return row
     return row
@@ -329,15 +488,15 @@ def run_parish_quality_check(surname_list, parish_mapped, parish_only_matched,
         .str.replace(r"^[^A-Za-zÀ-ÖØ-öø-ÿ]+", "", regex=True)
     )
 
+    matched_old = set(parish_only_matched["parish_old"].values)
+
     def _match_stk_parish(row):
         parish = str(row["parish"])
         parish_old = str(row["parish_old"])
-        if "Stockholm" in row["municipality"] and parish_old not in parish_only_matched["parish_old"].values:
-            parish_letters = "".join(re.findall(r"[A-Za-z]", parish))
-            for key, value in PARISH_DICT_KNOWN.items():
-                key_letters = "".join(re.findall(r"[A-Za-z]", key))
-                if abs(len(key) - len(parish)) <= 1 and parish_letters == key_letters:
-                    return value
+        if "Stockholm" in row["municipality"] and parish_old not in matched_old:
+            key = _KNOWN_PARISH_INDEX.first(parish, 1)
+            if key is not None:
+                return PARISH_DICT_KNOWN[key]
         return ""
 
     stockholm_known_par["matched_parish"] = stockholm_known_par.apply(_match_stk_parish, axis=1)
@@ -360,42 +519,49 @@ def run_parish_quality_check(surname_list, parish_mapped, parish_only_matched,
         parish_analyzed["parish"].fillna("")
         .str.replace(r"^[^A-Za-zÀ-ÖØ-öø-ÿ]+", "", regex=True)
     )
+    matched_old = set(parish_only_matched["parish_old"].values)
+    added_index = LetterSignatureIndex(df_parish_added_year_by_year["parish"].values)
     parish_analyzed = parish_analyzed[
         (~parish_analyzed["parish"].isin(parish_only_matched["parish_old"]))
         & (~parish_analyzed["parish"].isin(df_parish_added_year_by_year["parish_old"]))
         & (parish_analyzed["parish"] != "")
         & (parish_analyzed["parish"].apply(
             lambda s: (
-                (letters := ''.join(re.findall(r'[A-Za-z]', str(s))))
-                and not any(letters == ''.join(re.findall(r'[A-Za-z]', str(key)))
-                            for key in PARISH_DICT_KNOWN.keys())
-                and letters not in parish_only_matched["parish_old"].values
-                and not any(letters == ''.join(re.findall(r'[A-Za-z]', str(word)))
-                            for word in df_parish_added_year_by_year["parish"].values)
+                (letters := _letters(str(s)))
+                and letters not in _KNOWN_PARISH_INDEX
+                and letters not in matched_old
+                and letters not in added_index
             )
         ))
     ]
 
+    municipality_matcher = FuzzyMatcher(parish_mapped["municipality"])
+    parish_matcher = FuzzyMatcher(parish_mapped["Parish"])
+    subgroup_matchers = {}
+
     def _check_on_parishes(row):
         parish_ = str(row["parish"])
-        municip_, score, _ = fuzzy_match_rapidfuzz(row["municipality"], parish_mapped["municipality"])
+        municip_, score, _ = municipality_matcher.match(row["municipality"])
         municip_ = municip_ if score >= 85.5 else row["municipality"]
-        subgroup = parish_mapped[parish_mapped["municipality"] == municip_]
-        if not subgroup.empty:
-            match = fuzzy_match_rapidfuzz(parish_, subgroup["Parish"])
+        if municip_ not in subgroup_matchers:
+            subgroup = parish_mapped[parish_mapped["municipality"] == municip_]
+            subgroup_matchers[municip_] = (
+                FuzzyMatcher(subgroup["Parish"]) if not subgroup.empty else None)
+        if subgroup_matchers[municip_] is not None:
+            match = subgroup_matchers[municip_].match(parish_)
             if match and len(match) == 3:
                 best_match, score, _ = match
                 if score >= 85.5 and best_match is not None:
                     row["matched_parish"] = best_match
                     return row
-        match = fuzzy_match_rapidfuzz(parish_, parish_mapped["Parish"])
+        match = parish_matcher.match(parish_)
         if match and len(match) == 3:
             best_match, score, _ = match
             if score > 85.5 and best_match is not None:
                 row["matched_parish"] = best_match
                 return row
         parish_2 = re.sub(r'(\w+)\s*-\s*(\w+)', r'\1\2', parish_)
-        match = fuzzy_match_rapidfuzz(parish_2, parish_mapped["Parish"])
+        match = parish_matcher.match(parish_2)
         if match and len(match) == 3:
             best_match, score, _ = match
             if score > 85.5 and best_match is not None:
@@ -409,19 +575,26 @@ def run_parish_quality_check(surname_list, parish_mapped, parish_only_matched,
     parish_analyzed = parish_analyzed[parish_analyzed["matched_parish"] != ""]
 
     # -- Apply quality filter --
-    surname_list["parish"] = surname_list["parish"].apply(
-        lambda s: s if (
-            s in parish_only_matched["parish_old"].values
-            or s in df_parish_added_year_by_year["parish_old"].values
-            or s in parish_analyzed["parish_old"].values
-            or any(''.join(re.findall(r'[A-Za-z]', s)) == ''.join(re.findall(r'[A-Za-z]', word))
-                   and abs(len(s) - len(word)) <= 2
-                   for word in df_parish_added_year_by_year["parish"].values)
-            or any(''.join(re.findall(r'[A-Za-z]', s)) in word
-                   and abs(len(s) - len(word)) <= 2
-                   for word in parish_only_matched["parish"].values)
-        ) else ""
-    )
+    known_old = (matched_old
+                 | set(df_parish_added_year_by_year["parish_old"].values)
+                 | set(parish_analyzed["parish_old"].values))
+    # Matched parishes by length, for the "letters inside, length within
+    # two" test.
+    matched_by_len = {}
+    for word in parish_only_matched["parish"].values:
+        if isinstance(word, str):
+            matched_by_len.setdefault(len(word), []).append(word)
+
+    def _keep_parish(s):
+        if s in known_old or added_index.near(s, 2):
+            return True
+        letters = _letters(s)
+        return any(letters in word
+                   for n in range(len(s) - 2, len(s) + 3)
+                   for word in matched_by_len.get(n, ()))
+
+    surname_list["parish"] = map_unique(
+        surname_list["parish"], lambda s: s if _keep_parish(s) else "")
 
     if "parish_cleaned_" in surname_list.columns:
         surname_list = surname_list.drop(columns=["parish_cleaned_"])
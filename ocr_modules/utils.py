@@ -5,7 +5,9 @@ utils.py – Shared utility functions used across multiple modules.
 
 import re
 import unicodedata
+from collections import OrderedDict
 import regex as regex_mod
+import numpy as np
 import pandas as pd
 from rapidfuzz import process, fuzz
 
@@ -34,6 +36,106 @@ def fuzzy_match_rapidfuzz(x, choices):
         return (None, 0, None)
 
 
+# Whitespace rapidfuzz splits on in token_sort_ratio.  It treats U+0085 and
+# U+00A0 differently depending on the string's width, so strings holding
+# them are scored by rapidfuzz itself.
+_RF_WHITESPACE = re.compile(
+    "[\t\n\x0b\x0c\r\x1c-\x1f \u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000]+")
+_RF_AMBIGUOUS = re.compile("[\x85\xa0]")
+
+
+def _sort_tokens(s):
+    return " ".join(sorted(t for t in _RF_WHITESPACE.split(s) if t))
+
+
+class FuzzyMatcher:
+    """:func:`fuzzy_match_rapidfuzz` against a fixed set of choices.
+
+    The choices (a Series or list) are converted once: non-strings and
+    repeated strings are dropped (``extractOne`` returns the first of equal
+    scores anyway) and each choice is token-sorted up front, so a query is
+    scored with plain ``fuzz.ratio``.  Results are kept in an LRU cache of
+    *cache_size* queries; ``hits`` / ``misses`` count its use.
+    """
+
+    def __init__(self, choices, cache_size=4096):
+        self.choices = choices
+        items = choices.items() if hasattr(choices, "items") else enumerate(choices)
+        first = {}
+        for label, choice in items:
+            if isinstance(choice, str) and choice not in first:
+                first[choice] = label
+        self._names = list(first)
+        self._labels = list(first.values())
+        self._exact = any(_RF_AMBIGUOUS.search(name) for name in self._names)
+        self._sorted = [_sort_tokens(name) for name in self._names]
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def match(self, query):
+        """``(best_match, score, index)`` as :func:`fuzzy_match_rapidfuzz` returns it."""
+        try:
+            result = self._cache[query]
+        except (KeyError, TypeError):
+            pass
+        else:
+            self._cache.move_to_end(query)
+            self.hits += 1
+            return result
+        self.misses += 1
+        result = self._match(query)
+        if self.cache_size and isinstance(query, str):
+            self._cache[query] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def _match(self, query):
+        if not isinstance(query, str):
+            return fuzzy_match_rapidfuzz(query, self.choices)
+        if self._exact or _RF_AMBIGUOUS.search(query):
+            match = process.extractOne(query, self._names, scorer=fuzz.token_sort_ratio)
+        else:
+            match = process.extractOne(_sort_tokens(query), self._sorted, scorer=fuzz.ratio)
+        if match is None:
+            return (None, 0, None)
+        _choice, score, pos = match
+        return (self._names[pos], score, self._labels[pos])
+
+
+def fuzzy_match_rapidfuzz_batch(queries, choices, score_cutoff=0, workers=-1,
+                                chunk_size=256):
+    """Batch :func:`fuzzy_match_rapidfuzz` for many queries at once.
+
+    Distinct queries are scored against *choices* (a Series) with
+    ``process.cdist``, *chunk_size* queries per matrix.  Returns a dict
+    ``query → (best_match, score, index)`` holding the same best match
+    ``extractOne`` would pick, for the queries whose best score reaches
+    *score_cutoff*.
+    """
+    valid = [(label, choice) for label, choice in choices.items()
+             if isinstance(choice, str)]
+    labels = [label for label, _choice in valid]
+    names = [choice for _label, choice in valid]
+    unique = list(dict.fromkeys(q for q in queries if isinstance(q, str)))
+    results = {}
+    if not names:
+        return results
+    for start in range(0, len(unique), chunk_size):
+        part = unique[start:start + chunk_size]
+        scores = process.cdist(part, names, scorer=fuzz.token_sort_ratio,
+                               dtype=np.float64, score_cutoff=score_cutoff,
+                               workers=workers)
+        best = scores.argmax(axis=1)
+        for query, pos, row in zip(part, best, scores):
+            score = row[pos]
+            if score >= score_cutoff:
+                results[query] = (names[pos], score, labels[pos])
+    return results
+
+
 def clean_edges(txt: str) -> str:
     """Strip leading/trailing punctuation and whitespace (Unicode-aware)."""
     return regex_mod.sub(r'^[\p{P}\p{Zs}]+|[\p{P}\p{Zs}]+$', '', txt)
@@ -45,3 +147,331 @@ def complete_first_word(partial, full_line):
     if match:
         return match.group()
     return partial
+
+
+def map_unique(values, func):
+    """``values.apply(func)``, evaluating *func* once per distinct string.
+
+    Column lambdas tend to see the same few strings (parishes,
+    occupations) over and over, so the strings are factorized, *func* runs
+    on each distinct one and the results are mapped back by code.
+    Non-string entries go to *func* one at a time, since ``factorize``
+    would merge e.g. None with NaN, or 1 with True.
+    """
+    if len(values) == 0:
+        return values.apply(func)
+    is_str = values.map(lambda x: isinstance(x, str)).to_numpy(dtype=bool)
+    out = np.empty(len(values), dtype=object)
+    if is_str.any():
+        codes, uniques = pd.factorize(values[is_str])
+        results = np.empty(len(uniques), dtype=object)
+        for i, value in enumerate(uniques):
+            results[i] = func(value)
+        out[is_str] = results[codes]
+    for pos in np.flatnonzero(~is_str):
+        out[pos] = func(values.iat[pos])
+    return pd.Series(out, index=values.index, name=values.name).infer_objects()
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton for finding many literal substrings at once.
+
+    Pattern ids are the positions in *patterns*; :meth:`first` returns the
+    lowest id that occurs in a text, i.e. the same answer as testing
+    ``pattern in text`` for each pattern in order and stopping at the first
+    hit, but in a single pass over the text.  :meth:`hits` returns all of
+    them.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self._goto = [{}]
+        self._fail = [0]
+        # Pattern ids ending at each node (itself or via fail links), and the
+        # lowest of them.
+        self._out = [()]
+        self._best = [None]
+        for pid, pattern in enumerate(self.patterns):
+            if not isinstance(pattern, str):
+                continue
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                    self._best.append(None)
+                node = nxt
+            self._out[node] += (pid,)
+            if self._best[node] is None:
+                self._best[node] = pid
+        self._build_fail_links()
+
+    def _build_fail_links(self):
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] += self._out[self._fail[child]]
+                self._best[child] = _min_id(self._best[child], self._best[self._fail[child]])
+
+    def first(self, text):
+        """Lowest pattern id occurring in *text*, or ``None``."""
+        goto, fail, best = self._goto, self._fail, self._best
+        found = best[0]  # an empty pattern matches every text
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            hit = best[node]
+            if hit is not None and (found is None or hit < found):
+                found = hit
+                if found == 0:
+                    break
+        return found
+
+    def hits(self, text):
+        """Set of all pattern ids occurring in *text*."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set(out[0])
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
+
+
+def _min_id(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return min(a, b)
+
+
+# ── Regex alternation with a literal pre-filter ───────────────────────
+
+_CHAR_ESCAPES = {"a": "\a", "f": "\f", "n": "\n", "r": "\r", "t": "\t", "v": "\v"}
+_QUANTIFIER = re.compile(r"\*|\+|\?|\{(\d*)(?:,\d*)?\}")
+
+
+def _split_alternatives(pattern):
+    """Split *pattern* on its top-level ``|``."""
+    parts, start, depth, i, in_class = [], 0, 0, 0, False
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\":
+            i += 2
+            continue
+        if in_class:
+            in_class = c != "]"
+        elif c == "[":
+            in_class = True
+            if pattern[i + 1:i + 2] == "^":
+                i += 1
+            if pattern[i + 1:i + 2] == "]":
+                i += 1
+        elif c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+        elif c == "|" and depth == 0:
+            parts.append(pattern[start:i])
+            start = i + 1
+        i += 1
+    parts.append(pattern[start:])
+    return parts
+
+
+def _skip_bracket(pattern, i):
+    """Index just past the ``[...]`` class or ``(...)`` group at *i*."""
+    depth, in_class = 0, False
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\":
+            i += 2
+            continue
+        if in_class:
+            in_class = c != "]" or i == class_start
+        elif c == "[":
+            in_class = True
+            class_start = i + 1
+            if pattern[class_start:class_start + 1] == "^":
+                class_start += 1
+        elif c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+        i += 1
+        if not in_class and depth == 0:
+            return i
+    return i
+
+
+def _literal_runs(alternative):
+    """Literal substrings every match of *alternative* must contain.
+
+    Returns ``(runs, pure)`` where *pure* means the alternative is nothing
+    but a literal string (then ``runs`` holds exactly that string).
+    """
+    runs, run, pure, i = [], [], True, 0
+    while i < len(alternative):
+        c = alternative[i]
+        atom = None
+        if c == "\\":
+            nxt = alternative[i + 1]
+            if nxt in _CHAR_ESCAPES:
+                atom = _CHAR_ESCAPES[nxt]
+            elif not nxt.isalnum():
+                atom = nxt
+            i += 2
+        elif c in "[(":
+            # A class or group is never part of a literal run.
+            i = _skip_bracket(alternative, i)
+        elif c in ".^$":
+            i += 1
+        else:
+            atom = c
+            i += 1
+
+        quantifier = _QUANTIFIER.match(alternative, i)
+        if quantifier:
+            i = quantifier.end()
+            if alternative[i:i + 1] in ("?", "+"):  # lazy / possessive
+                i += 1
+        if atom is None or quantifier:
+            pure = False
+            if atom is not None and quantifier.group() == "+":
+                run.append(atom)
+            elif atom is not None and quantifier.group(1):
+                if int(quantifier.group(1)) > 0:
+                    run.append(atom)
+            if run:
+                runs.append("".join(run))
+            run = []
+        else:
+            run.append(atom)
+    if run:
+        runs.append("".join(run))
+    return runs, pure
+
+
+_TRAILING_NEG_LOOKAHEAD = re.compile(r"\(\?![^()]*\)$")
+_TRAILING_ZERO_WIDTH = re.compile(r"(?:\$|\\[bBZ]|\(\?<?[=!][^()]*\))$")
+
+
+def truncation_closed(pattern):
+    """Variant of *pattern* that matches a string iff *pattern* matches one
+    of its prefixes.
+
+    Only zero-width assertions at the right edge of an alternative depend on
+    what follows a match.  A trailing negative lookahead always holds at the
+    end of a prefix, and so does a trailing ``\\b`` after a literal letter,
+    so both are dropped; any other trailing assertion raises ``ValueError``.
+    """
+    closed = []
+    for alternative in _split_alternatives(pattern):
+        while _TRAILING_ZERO_WIDTH.search(alternative):
+            if _TRAILING_NEG_LOOKAHEAD.search(alternative):
+                alternative = _TRAILING_NEG_LOOKAHEAD.sub("", alternative)
+            elif (alternative.endswith("\\b") and alternative[-3:-2].isalnum()
+                  and alternative[-4:-3] != "\\"):
+                alternative = alternative[:-2]
+            else:
+                raise ValueError(f"cannot close alternative under truncation: {alternative!r}")
+        closed.append(alternative)
+    return "|".join(closed)
+
+
+class PrefilteredPattern:
+    """A regex alternation with a literal-substring pre-filter.
+
+    Every alternative of *pattern* has a literal substring that must be
+    present for it to match (its longest literal run).  These are found in
+    one pass with :class:`AhoCorasick`; a line containing none of them
+    cannot match and is rejected without running the regex.  For a yes/no
+    answer, a hit on an alternative that is a plain literal is already a
+    match, and otherwise only the regex-only alternatives are run.
+    ``search`` and ``findall`` run the full pattern whenever the pre-filter
+    passes, so their results are exactly those of the ``re`` module.
+    """
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.regex = re.compile(pattern)
+        literals, pure_literal, regex_alts = [], [], []
+        self._always = False
+        for alternative in _split_alternatives(pattern):
+            runs, pure = _literal_runs(alternative)
+            if not runs:
+                self._always = True
+                break
+            literals.append(max(runs, key=len))
+            pure_literal.append(pure)
+            if not pure:
+                regex_alts.append(alternative)
+        self._automaton = AhoCorasick(literals)
+        self._pure_literal = pure_literal
+        self._regex_alts = re.compile("|".join(regex_alts)) if regex_alts else None
+
+    def _candidates(self, text):
+        """Pre-filter hits in *text*, or ``None`` when the regex must run."""
+        if self._always or not isinstance(text, str):
+            return None
+        return self._automaton.hits(text)
+
+    def has_match(self, text):
+        """``bool(re.search(pattern, text))``."""
+        hits = self._candidates(text)
+        if hits is None:
+            return self.regex.search(text) is not None
+        if not hits:
+            return False
+        if any(self._pure_literal[pid] for pid in hits):
+            return True
+        return self._regex_alts.search(text) is not None
+
+    def search(self, text):
+        """Same as ``re.search(pattern, text)``."""
+        hits = self._candidates(text)
+        if hits is not None and not hits:
+            return None
+        return self.regex.search(text)
+
+    def findall(self, text):
+        """Same as ``re.findall(pattern, text)``."""
+        hits = self._candidates(text)
+        if hits is not None and not hits:
+            return []
+        return self.regex.findall(text)
+
+    def contains(self, series, na=None):
+        """Same as ``series.str.contains(pattern, regex=True, na=na)``.
+
+        Only rows passing the literal pre-filter reach ``str.contains``;
+        the others are strings that cannot match and are ``False``.
+        """
+        keep = np.fromiter(
+            (not isinstance(v, str) or self._candidates(v) != set() for v in series),
+            dtype=bool, count=len(series))
+        if keep.all():
+            return series.str.contains(self.regex, na=na)
+        matched = series[keep].str.contains(self.regex, na=na)
+        if matched.dtype == bool or matched.empty:
+            result = pd.Series(False, index=series.index)
+        else:
+            result = pd.Series(False, index=series.index, dtype=object)
+        result[keep] = matched.to_numpy()
+        return result
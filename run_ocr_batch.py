@@ -25,6 +25,8 @@ def main() -> None:
 
     frames = build_ocr_inputs(cfg)
     ocr_out_dir = Path(cfg.out_dir) / "ocr_inputs"
+    # Shared by all providers: identical lines are only matched once.
+    match_cache_path = Path(cfg.out_dir) / "last_name_match_cache.sqlite"
     write_ocr_inputs(frames, str(ocr_out_dir))
 
     for name in sorted(frames.keys()):
@@ -36,6 +38,8 @@ def main() -> None:
             output_prefix=f"final_output_{name}",
             checkpoint_prefix=name,
             report_dir=str(provider_out_dir / "reports"),
+            match_cache_path=str(match_cache_path),
+            match_batch=True,
         )
 
 
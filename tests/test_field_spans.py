@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""Field spans must point at their field's text in line_complete."""
+
+import pandas as pd
+
+from ocr_modules import line_processing
+
+
+def _frame():
+    return pd.DataFrame({
+        "line_complete": ["Berg, A. B., kamrer, Kh. 4500", "Lind, K., f. d. snickare, 1200"],
+        "last_name": ["Berg", "Lind"],
+        "initials": ["A. B.", "K."],
+        "second_last_name": ["", ""],
+        "occ_reg": ["kamrer", "snickare"],
+        "parish": ["Kh.", ""],
+        "parish_start": [21, -1],
+        "parish_end": [24, -1],
+        "income": ["4500", 1200.0],
+        "income_start": [25, 26],
+        "income_end": [29, 30],
+    })
+
+
+def test_locate_fields():
+    df = line_processing.locate_fields(_frame())
+    for field in ("last_name", "initials", "occ_reg"):
+        for line, value, start, end in zip(df["line_complete"], df[field],
+                                           df[f"{field}_start"], df[f"{field}_end"]):
+            assert line[start:end] == value
+
+
+def test_clear_stale_spans_keeps_valid_spans():
+    df = line_processing.clear_stale_spans(line_processing.locate_fields(_frame()))
+    assert (df[["last_name_start", "initials_start", "occ_reg_start"]] >= 0).all().all()
+    assert df["parish_start"].tolist() == [21, -1]
+    assert df["income_start"].tolist() == [25, 26]
+
+
+def test_clear_stale_spans_resets_rewritten_fields():
+    df = line_processing.locate_fields(_frame())
+    df.loc[0, "parish"] = ""
+    df.loc[1, "initials"] = "Karl"
+    df.loc[0, "occ_reg"] = "KAMRER"
+    df.loc[1, "line_complete"] = "Lind, K., f. d. snickare, 9999 1200"
+    df = line_processing.clear_stale_spans(df)
+    assert df["parish_start"].tolist() == [-1, -1]
+    assert df["initials_end"].tolist()[1] == -1
+    assert df["occ_reg_start"].tolist()[0] >= 0
+    assert df["income_start"].tolist()[1] == -1
+
+
+def test_remove_occupation_without_occ_reg_has_no_span():
+    residuals = line_processing.ResidualLines(["Berg, A., kamrer, Kh. 4500"])
+    residuals.remove_first(["Berg"])
+    residuals.remove_first(["A."])
+    assert residuals.remove_occupation([""]) == ([-1], [-1])
+    assert residuals.text == ["Kh. 4500"]
+
+
+def test_span_across_removed_f_d_is_dropped():
+    line = "Lind, K., sni f. d. ckare, Kh. 1200"
+    residuals = line_processing.ResidualLines([line])
+    residuals.remove_first(["Lind"])
+    residuals.remove_first(["K."])
+    residuals.remove_f_d()
+    assert residuals.remove_occupation(["sni  ckare"]) == ([-1], [-1])
+    assert residuals.text == ["Kh. 1200"]
+
+
+def test_occupation_span_after_length_changing_lowercase():
+    residuals = line_processing.ResidualLines(["Sjoman, İx L., kontorist, Kh. 5370"])
+    residuals.remove_first(["Sjoman"])
+    starts, ends = residuals.remove_occupation(["kontorist"])
+    assert (starts, ends) == ([-1], [-1])
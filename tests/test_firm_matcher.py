@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""FIRM_MATCHER must give exactly what ``re`` gives for FIRM_PATTERN."""
+
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ocr_modules.config import FIRM_MATCHER, FIRM_PATTERN
+
+FIRM_RE = re.compile(FIRM_PATTERN)
+
+CORPUS = [
+    "",
+    "Andersson, Karl, snickare, Kh. 2400",
+    "Berg, A., disponent, AB Separator, 12000",
+    "Lind, E., kamrer, Handelsbanken 5400-3200",
+    "Nilsson, K., kassör vid Sthlms Sparbank",
+    "Kredit kassan",
+    "Akreditiv, Akt.",
+    "Akt. Bolaget Nord",
+    "Sveriges Akt.-bol. Norden",
+    "Bergman & C:o, grosshandlare",
+    "c:o Ltd",
+    "A .B-. Svea",
+    "A.  -B Svea",
+    "A.B Svea",
+    "A-B Svea",
+    "A- B Svea",
+    "u.p.a",
+    "u.p.\x07",
+    "u. p. a. förening",
+    "Statens jarnvag, 4500",
+    "jarnvagsman",
+    "Jarnvag-",
+    "Norrtelje elektricitetsverk, 3000",
+    "Norrtelje elektricitetsverk",
+    "Tändsticksfabrik",
+    "Stora tändsticksfabrik ",
+    "Sockerfabrik",
+    "Bank, 7000",
+    "Banker",
+    "bank.",
+    "bankir",
+    "Schweizerische Unfallversicherungs-A.-G. Kh., 16850-16800",
+    "Schweizerische Unfallversicherungs-AxG. Kh., 16850-16800",
+    "Mellersta & Norra Sveriges Angpannefor- ening",
+    "Pram- & Bogs",
+    "Elektr.-verk",
+    "Elektrxverk",
+    "Elektricitetsv.",
+    "Elektricitetsvx",
+    "El.-verk, 2000",
+    "hofding gre",
+    "Allm. Änkekassan",
+    "Allmänna",
+    "-akt.-bol.",
+    "a.-b. Nord",
+    "L:td",
+    "Ltd",
+    "fonden",
+    "Fonden",
+    "kooperativ",
+    "Koop. förening",
+    "Pilgrimstads Andersmejeri",
+    "Pilgrimstads Andersmejer",
+    "Spr",
+    "Svensk",
+    "Svenska",
+    "AAAB",
+    "ab",
+    "Bolag Bolaget bolag",
+    "firma Lind & Co",
+    "Åberg, Öhman & C:o",
+    "ÅB",
+    "   ",
+    "-b.",
+    "-bol",
+]
+
+
+def _corpus():
+    """Hand-picked lines plus each alternative's literal form in context."""
+    lines = list(CORPUS)
+    for alternative in FIRM_PATTERN.split("|"):
+        literal = re.sub(r"\\[bs]|\\|\(\?![^)]*\)|\[[^]]*\][+*]?|\{\d+,?\d*\}|\*",
+                         "", alternative)
+        lines += [literal, f"Lind, K., {literal}, 3000", literal[:-1],
+                  literal[1:], literal.lower(), f"x{literal}x"]
+    return lines
+
+
+LINES = _corpus()
+
+
+@pytest.mark.parametrize("line", LINES)
+def test_search(line):
+    got, expected = FIRM_MATCHER.search(line), FIRM_RE.search(line)
+    assert (got and got.span()) == (expected and expected.span())
+
+
+@pytest.mark.parametrize("line", LINES)
+def test_findall_and_has_match(line):
+    assert FIRM_MATCHER.findall(line) == FIRM_RE.findall(line)
+    assert FIRM_MATCHER.has_match(line) == bool(FIRM_RE.search(line))
+
+
+def test_contains_all_strings():
+    lines = pd.Series(LINES)
+    expected = lines.str.contains(FIRM_PATTERN, regex=True)
+    pd.testing.assert_series_equal(FIRM_MATCHER.contains(lines), expected)
+
+
+@pytest.mark.parametrize("na", [None, False, True])
+def test_contains_with_missing(na):
+    lines = pd.Series(["AB Svea", np.nan, "Andersson", None, "Bank, 7000", "Lind"],
+                      index=[5, 3, 9, 1, 0, 2])
+    expected = lines.str.contains(FIRM_PATTERN, regex=True, na=na)
+    pd.testing.assert_series_equal(FIRM_MATCHER.contains(lines, na=na), expected)
+
+
+def test_contains_no_candidates():
+    lines = pd.Series(["Andersson", "Lind"], index=[4, 7])
+    expected = lines.str.contains(FIRM_PATTERN, regex=True)
+    pd.testing.assert_series_equal(FIRM_MATCHER.contains(lines), expected)
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""extract_income must agree with the row-wise extr_inc / split_income."""
+
+import re
+
+import pandas as pd
+import pytest
+
+from ocr_modules import income
+
+LINES = [
+    "Berg, A., kamrer, Kh. 4500-3200",
+    "Berg, A., 1234,",
+    "Berg, A., 1234,\n",
+    "x 5 .\n",
+    "x 5 .",
+    "x 5\n",
+    "abc 123,,",
+    "12.5",
+    "hustru Lind, 7400",
+    "Ström, 4 500 - 1 200",
+    "Åberg, ²3",
+    "",
+    "no digits here",
+]
+
+
+def _row_wise(df):
+    df = df.copy()
+    df["income"] = 0
+    df = df.apply(income.extr_inc, axis=1)
+    df["income_1"] = ""
+    df["income_2"] = ""
+    df = df.apply(income.split_income, axis=1)
+    df["income"] = df["income"].apply(
+        lambda x: x if bool(re.search(r'\d', str(x))) else "")
+    return df
+
+
+@pytest.mark.parametrize("split", [0, 1, 2, 3])
+def test_extract_income_matches_row_wise(split):
+    df = pd.DataFrame({"line_complete": LINES, "split": split})
+    expected = _row_wise(df)
+    result = income.extract_income(df.copy())
+    cols = ["income", "income_start", "income_end", "income_1", "income_2"]
+    pd.testing.assert_frame_equal(result[cols], expected[cols])
+
+
+@pytest.mark.parametrize("line", ["Berg, A., 1234,\n", "x 5 .\n"])
+def test_trailing_newline_after_punctuation_has_no_income(line):
+    result = income.extract_income(pd.DataFrame({"line_complete": [line], "split": [1]}))
+    assert result.loc[0, "income"] == ""
+    assert (result.loc[0, "income_start"], result.loc[0, "income_end"]) == (-1, -1)
+
+
+def test_unite_lines():
+    df = pd.DataFrame({
+        "line": ["Berg, A., kam-", "rer, 4500", "Lind, K.,", "-", "snickare 1200", "Ek, P.,", "-"],
+        "split": [1, 2, 1, 0, 2, 1, 0],
+    })
+    result = income.unite_lines(df)
+    assert result["line_complete"].tolist() == [
+        "Berg, A., kam- rer, 4500", "rer, 4500", "Lind, K., snickare 1200", "-",
+        "snickare 1200", "Ek, P.,", "-",
+    ]
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""cleaned_parish must use the signature index it is given, or build one per dict."""
+
+import pandas as pd
+
+from ocr_modules import parish
+
+
+def _row(value):
+    return pd.Series({"parish": value, "parish_cleaned_": ""})
+
+
+def test_caller_index_is_used_with_default_dict():
+    assert parish.cleaned_parish(_row("Kh"))["parish_cleaned_"] != ""
+    index = parish.LetterSignatureIndex([])
+    row = parish.cleaned_parish(_row("Kh"), signature_index=index)
+    assert row["parish_cleaned_"] == ""
+
+
+def test_custom_dict_index_is_built_once(monkeypatch):
+    built = []
+    real = parish.LetterSignatureIndex
+
+    def counting(strings):
+        built.append(strings)
+        return real(strings)
+
+    monkeypatch.setattr(parish, "LetterSignatureIndex", counting)
+    dict_ = {"Kh.": "Hedvig Eleonora", "Ja.": "Jakob"}
+    df = pd.DataFrame({"parish": ["Kh", "Ja.", "K-h", "Zz"], "parish_cleaned_": ""})
+    df = df.apply(lambda row: parish.cleaned_parish(row, dict_), axis=1)
+    assert df["parish_cleaned_"].tolist() == ["Hedvig Eleonora", "Jakob", "Hedvig Eleonora", ""]
+    assert len(built) == 1